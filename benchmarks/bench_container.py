@@ -0,0 +1,162 @@
+"""
+Benchmarks for :class:`pythern.container.Container` resolution hot paths.
+"""
+import threading
+
+import pythern.container as container
+
+
+DEEP_GRAPH_DEPTH = 50
+WIDE_GRAPH_WIDTH = 50
+REGISTRY_SIZE = 10000
+THREADS = 8
+THREAD_ITERATIONS = 1000
+
+
+class Service:
+    pass
+
+
+class Composite:
+    def __init__(self, service, manager):
+        self.service = service
+        self.manager = manager
+
+
+def make_type(name, arguments):
+    # Types are resolved by the names of their constructor arguments, so the
+    # constructors of generated graphs need to be generated too.
+    parameters = "".join(f", {argument}" for argument in arguments)
+    namespace = {}
+    exec(f"def __init__(self{parameters}):\n    self.arguments = ({parameters[2:]},)", namespace)
+    return type(name, (), {"__init__": namespace["__init__"]})
+
+
+def make_deep_container(depth=DEEP_GRAPH_DEPTH):
+    di_container = container.Container()
+    di_container.register_type("level_0", Service)
+    for level in range(1, depth):
+        level_type = make_type(f"Level{level}", [f"level_{level - 1}"])
+        di_container.register_type(f"level_{level}", level_type)
+    return di_container, f"level_{depth - 1}"
+
+
+def make_wide_container(width=WIDE_GRAPH_WIDTH):
+    di_container = container.Container()
+    arguments = [f"leaf_{index}" for index in range(width)]
+    for argument in arguments:
+        di_container.register_type(argument, Service)
+    di_container.register_type("root", make_type("Wide", arguments))
+    return di_container, "root"
+
+
+def make_composite_container():
+    di_container = container.Container()
+    di_container.register_instance("service", Service())
+    di_container.register_type("manager", Service)
+    di_container.register_type("composite", Composite)
+    return di_container
+
+
+def benchmark_resolve_instance():
+    di_container = make_composite_container()
+    return lambda: di_container.resolve("service")
+
+
+def benchmark_resolve_type():
+    di_container = make_composite_container()
+    return lambda: di_container.resolve("manager")
+
+
+def benchmark_resolve_transient_factory():
+    di_container = container.Container()
+    di_container.register_factory("service", lambda c: Service())
+    return lambda: di_container.resolve("service")
+
+
+def benchmark_resolve_singleton_factory():
+    di_container = container.Container()
+    di_container.register_factory("service", lambda c: Service(), is_singleton=True)
+    return lambda: di_container.resolve("service")
+
+
+def benchmark_resolve_composite():
+    di_container = make_composite_container()
+    return lambda: di_container.resolve("composite")
+
+
+def benchmark_resolve_unregistered_type():
+    di_container = make_composite_container()
+    return lambda: di_container.resolve(Composite)
+
+
+def benchmark_resolve_deep_graph():
+    di_container, interface = make_deep_container()
+    return lambda: di_container.resolve(interface)
+
+
+def benchmark_resolve_wide_graph():
+    di_container, interface = make_wide_container()
+    return lambda: di_container.resolve(interface)
+
+
+def benchmark_compiled_deep_graph():
+    di_container, interface = make_deep_container()
+    return di_container.compile(interface)
+
+
+def benchmark_compiled_wide_graph():
+    di_container, interface = make_wide_container()
+    return di_container.compile(interface)
+
+
+def benchmark_build_and_resolve_deep_graph():
+    def first_resolve():
+        di_container, interface = make_deep_container()
+        di_container.resolve(interface)
+
+    return first_resolve
+
+
+def benchmark_resolve_high_cardinality_factories():
+    di_container = container.Container()
+    for index in range(REGISTRY_SIZE):
+        di_container.register_factory(f"service_{index}", lambda c: Service())
+    interfaces = [f"service_{index}" for index in range(0, REGISTRY_SIZE, 97)]
+
+    def resolve_all():
+        for interface in interfaces:
+            di_container.resolve(interface)
+
+    return resolve_all
+
+
+def benchmark_create_child_container():
+    di_container, _ = make_deep_container()
+    return di_container.child
+
+
+def benchmark_resolve_deep_graph_in_child():
+    di_container, interface = make_deep_container()
+    child = di_container.child()
+    child.register_instance("level_0", Service())
+    return lambda: child.resolve(interface)
+
+
+def benchmark_threaded_singleton_resolve():
+    di_container = container.Container()
+    di_container.register_factory("service", lambda c: Service(), is_singleton=True)
+
+    def worker():
+        for _ in range(THREAD_ITERATIONS):
+            di_container.resolve("service")
+
+    return lambda: _run_threads(worker)
+
+
+def _run_threads(worker, threads=THREADS):
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
@@ -0,0 +1,56 @@
+"""
+Benchmarks for :class:`pythern.object_factory.ObjectBuilderFactory` hot paths.
+"""
+import pythern.object_factory as object_factory
+
+
+REGISTRY_SIZE = 10000
+
+
+class Product:
+    def __init__(self, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+
+
+class ProductBuilder:
+    def build(self, *args, **kwargs):
+        return Product(*args, **kwargs)
+
+
+def benchmark_create_with_callable_builder():
+    factory = object_factory.ObjectBuilderFactory()
+    factory.register_type("product", Product)
+    return lambda: factory.create("product")
+
+
+def benchmark_create_with_build_method():
+    factory = object_factory.ObjectBuilderFactory()
+    factory.register_type("product", ProductBuilder())
+    return lambda: factory.create("product")
+
+
+def benchmark_create_with_arguments():
+    factory = object_factory.ObjectBuilderFactory()
+    factory.register_type("product", ProductBuilder())
+    return lambda: factory.create("product", 1, 2, name="product")
+
+
+def benchmark_create_high_cardinality():
+    factory = object_factory.ObjectBuilderFactory()
+    for index in range(REGISTRY_SIZE):
+        factory.register_type(f"product_{index}", ProductBuilder())
+    type_ids = [f"product_{index}" for index in range(0, REGISTRY_SIZE, 97)]
+
+    def create_all():
+        for type_id in type_ids:
+            factory.create(type_id)
+
+    return create_all
+
+
+def benchmark_create_many():
+    factory = object_factory.ObjectBuilderFactory()
+    factory.register_type("product", ProductBuilder())
+    arguments = [(index,) for index in range(1000)]
+    return lambda: factory.create_many("product", arguments)
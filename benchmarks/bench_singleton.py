@@ -0,0 +1,34 @@
+"""
+Benchmarks for :class:`pythern.singleton.Singleton` hot paths.
+"""
+import threading
+
+import pythern.singleton as singleton
+
+
+THREADS = 8
+THREAD_ITERATIONS = 1000
+
+
+class Service(metaclass=singleton.Singleton):
+    pass
+
+
+def benchmark_singleton_call():
+    Service()
+    return Service
+
+
+def benchmark_threaded_singleton_call():
+    def worker():
+        for _ in range(THREAD_ITERATIONS):
+            Service()
+
+    def run_threads():
+        workers = [threading.Thread(target=worker) for _ in range(THREADS)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+
+    return run_threads
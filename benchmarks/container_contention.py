@@ -0,0 +1,76 @@
+"""
+Measures how :class:`pythern.container.Container` behaves when many threads
+resolve a singleton factory from a cold container at the same time. It reports
+how many times the factory was invoked, which should always be one, and the
+throughput of the lock-free path once the singleton exists.
+
+..  code-block:: bash
+
+    python benchmarks/container_contention.py --threads 32 --iterations 10000
+"""
+import argparse
+import threading
+import time
+
+import pythern.container as container
+
+
+class ExpensiveService:
+    pass
+
+
+class CountingFactory:
+    def __init__(self, construction_time):
+        self.construction_time = construction_time
+        self.invocations = 0
+
+    def __call__(self, container):
+        self.invocations += 1
+        time.sleep(self.construction_time)
+        return ExpensiveService()
+
+
+def run(threads, iterations, construction_time):
+    factory = CountingFactory(construction_time)
+    di_container = container.Container()
+    di_container.register_factory("service", factory, is_singleton=True)
+    barrier = threading.Barrier(threads)
+    instances = set()
+
+    def worker():
+        barrier.wait()
+        instances.add(id(di_container.resolve("service")))
+        for _ in range(iterations):
+            di_container.resolve("service")
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    resolutions = threads * (iterations + 1)
+    return {
+        "threads": threads,
+        "resolutions": resolutions,
+        "factory_invocations": factory.invocations,
+        "distinct_instances": len(instances),
+        "seconds": elapsed,
+        "resolutions_per_second": resolutions / elapsed,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Container singleton contention benchmark")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--iterations", type=int, default=10000)
+    parser.add_argument("--construction-time", type=float, default=0.05)
+    options = parser.parse_args(argv)
+    results = run(options.threads, options.iterations, options.construction_time)
+    for name, value in results.items():
+        print(f"{name}: {value}")
+
+
+if __name__ == "__main__":
+    main()
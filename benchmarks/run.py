@@ -0,0 +1,114 @@
+"""
+Runs the benchmarks of the project and saves the results as JSON, so runs can
+be compared against each other. Benchmarks are the ``benchmark_*`` functions of
+the modules in :data:`BENCHMARK_MODULES`. Each function prepares what it needs
+and returns the callable to be timed.
+
+..  code-block:: bash
+
+    python benchmarks/run.py --output output/benchmarks/results.json
+    python benchmarks/run.py --filter resolve --compare output/benchmarks/results.json
+"""
+import argparse
+import datetime
+import importlib
+import inspect
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+
+
+BENCHMARK_MODULES = [
+    "bench_container",
+    "bench_object_factory",
+    "bench_singleton",
+]
+
+
+def collect_benchmarks(name_filter=None):
+    benchmarks = {}
+    for module_name in BENCHMARK_MODULES:
+        module = importlib.import_module(module_name)
+        for name, function in inspect.getmembers(module, inspect.isfunction):
+            if not name.startswith("benchmark_"):
+                continue
+            benchmark_name = f"{module_name}.{name[len('benchmark_'):]}"
+            if name_filter and name_filter not in benchmark_name:
+                continue
+            benchmarks[benchmark_name] = function
+    return benchmarks
+
+
+def measure(create_benchmark, repeat):
+    timer = timeit.Timer(create_benchmark())
+    number, _ = timer.autorange()
+    per_call = [elapsed / number for elapsed in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "number": number,
+        "repeat": repeat,
+        "min": min(per_call),
+        "median": statistics.median(per_call),
+        "max": max(per_call),
+    }
+
+
+def run(name_filter=None, repeat=5):
+    results = {}
+    for name, create_benchmark in collect_benchmarks(name_filter).items():
+        results[name] = measure(create_benchmark, repeat)
+        print(f"{name:<60} {_format_time(results[name]['median'])}")
+    return {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "benchmarks": results,
+    }
+
+
+def compare(results, baseline):
+    print()
+    print(f"{'benchmark':<60} {'baseline':>12} {'current':>12} {'ratio':>8}")
+    for name, current in results["benchmarks"].items():
+        previous = baseline["benchmarks"].get(name)
+        if previous is None:
+            continue
+        ratio = current["median"] / previous["median"]
+        print(
+            f"{name:<60} {_format_time(previous['median']):>12} "
+            f"{_format_time(current['median']):>12} {ratio:>7.2f}x"
+        )
+
+
+def _format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Runs the pythern benchmarks")
+    parser.add_argument("--filter", help="Only run benchmarks containing this text")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="File where the JSON results are saved")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare")
+    options = parser.parse_args(argv)
+    baseline = None
+    if options.compare:
+        with open(options.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+    results = run(options.filter, options.repeat)
+    if baseline:
+        compare(results, baseline)
+    if options.output:
+        os.makedirs(os.path.dirname(os.path.abspath(options.output)), exist_ok=True)
+        with open(options.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,7 @@ bolt.register_task("default", ["pip", "ut"])
 bolt.register_task("clear-pyc", ["delete-pyc.source", "delete-pyc.tests"])
 bolt.register_task("ct", ["conttest"])
 bolt.register_task("ut", ["clear-pyc", "shell.pytest"])
+bolt.register_task("bench", ["shell.benchmarks"])
 
 # CI/CD tasks
 bolt.register_task("run-unit-tests", ["clear-pyc", "shell.pytest.coverage"])
@@ -16,9 +17,11 @@ bolt.register_task("run-unit-tests", ["clear-pyc", "shell.pytest.coverage"])
 PROJECT_ROOT = os.path.abspath(os.path.dirname(__file__))
 SRC_DIR = os.path.join(PROJECT_ROOT, about.project)
 TEST_DIR = os.path.join(PROJECT_ROOT, "tests")
+BENCHMARK_DIR = os.path.join(PROJECT_ROOT, "benchmarks")
 OUTPUT_DIR = os.path.join(PROJECT_ROOT, "output")
 COVERAGE_DIR = os.path.join(OUTPUT_DIR, "coverage")
 TEST_RESULTS_REPORT = os.path.join(OUTPUT_DIR, "unit", "test-report.html")
+BENCHMARK_RESULTS = os.path.join(OUTPUT_DIR, "benchmarks", "results.json")
 
 
 config = {
@@ -44,6 +47,14 @@ config = {
                 ]
             },
         },
+        "benchmarks": {
+            "command": sys.executable,
+            "arguments": [
+                os.path.join(BENCHMARK_DIR, "run.py"),
+                "--output",
+                BENCHMARK_RESULTS,
+            ],
+        },
     },
     "delete-pyc": {
         "recursive": True,
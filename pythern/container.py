@@ -1,32 +1,275 @@
 """
 """
+import asyncio
+import contextlib
+import contextvars
+import functools
 import inspect
-from collections import namedtuple
+import threading
+import time
+import weakref
+from collections import ChainMap, namedtuple
+from concurrent import futures
 
+from pythern.importing import import_object
+from pythern.object_factory import ObjectTypeNotRegisteredError
+from pythern.object_pool import ObjectPool
+
+
+_FactoryInfo = namedtuple(
+    'FactoryInfo', ['factory', 'is_singleton', 'is_lazy', 'is_weak']
+)
+_TypeInfo = namedtuple("TypeInfo", ["type_class", "is_lazy"])
+_KeyedInfo = namedtuple("KeyedInfo", ["builder", "is_singleton"])
+_ResolutionPlan = namedtuple("ResolutionPlan", ["registry", "target", "arguments"])
+
+_INSTANCE = "instance"
+_TYPE = "type"
+_FACTORY = "factory"
+_LAZY = "lazy"
+
+ResolutionStats = namedtuple(
+    "ResolutionStats",
+    ["resolutions", "cache_hits", "constructions", "total_time", "max_time"],
+)
+
+DisposalReport = namedtuple("DisposalReport", ["durations", "errors", "pending"])
+
+Eviction = namedtuple("Eviction", ["container", "interface", "instance"])
+
+KeyedBinding = namedtuple("KeyedBinding", ["interface", "key"])
+
+_UNRESOLVABLE = _ResolutionPlan(None, None, ())
+_MISSING = object()
+
+# Container and interface of the singleton being constructed in the current
+# context, used to record which interfaces each singleton depends on.
+_construction_owner = contextvars.ContextVar("pythern_construction_owner", default=None)
 
-_FactoryInfo = namedtuple('FactoryInfo', ['factory', 'is_singleton'])
 
 class Container:
     """ """
 
     def __init__(self):
+        self._parent = None
+        self._children = None
         self._factories = {}
         self._instances = {}
+        self._weak_instances = {}
         self._types = {}
+        self._pools = {}
+        self._keyed = {}
+        self._keyed_instances = {}
+        self._plans = {}
+        self._keyed_plans = {}
+        self._resolvable = {}
+        self._type_arguments = {}
+        self._imported = {}
+        self._locks = {}
+        self._pending = {}
+        self._instrumentation = None
+        self._owned = {}
+        self._dependencies = {}
+        self._dependents = {}
+        self._recording = 0
+        self._recording_lock = threading.Lock()
+
+    def register_factory(
+        self, interface, factory, is_singleton=False, is_lazy=False, is_weak=False
+    ):
+        """
+        Registers a ``factory`` that is invoked with the container to create
+        the object for ``interface``. The object is created only once and
+        reused when ``is_singleton`` is set. When ``is_lazy`` is set, resolving
+        the interface returns a proxy that invokes the factory on first use.
 
-    def register_factory(self, interface, factory, is_singleton=False):
-        self._factories[interface] = _FactoryInfo(factory=factory, is_singleton=is_singleton)
+        When ``is_weak`` is set, the object is shared like a singleton, but the
+        container only keeps a weak reference to it, so it is released when
+        nothing else references it and created again the next time it is
+        resolved. The object must support weak references.
+
+        Registering an interface again evicts the singletons created from its
+        previous registration, and the singletons that depended on them
+        directly or transitively, so they are created again the next time they
+        are resolved. Evicted singletons are not closed; they are returned so
+        the caller can dispose them. Singletons of child containers depending
+        on the interface are evicted and returned too, before the singletons
+        of this container.
+
+        :return:
+            A list of :class:`Eviction` tuples with the container that owned
+            each evicted singleton, its interface and the singleton.
+        """
+        evicted = self._evict_dependents(interface)
+        self._factories[interface] = _FactoryInfo(
+            factory=factory, is_singleton=is_singleton, is_lazy=is_lazy, is_weak=is_weak
+        )
+        self._invalidate_plans()
+        return evicted
 
     def register_instance(self, interface, instance):
-        """ """
+        """
+        Registers ``instance`` as the object for ``interface``. Singletons that
+        depend on a previous registration are evicted as described in
+        :meth:`register_factory`.
+        """
+        evicted = self._evict_dependents(interface)
         self._instances[interface] = instance
+        self._invalidate_plans()
+        return evicted
 
-    def register_type(self, interface, type_class):
-        """ """
-        self._types[interface] = type_class
+    def register_type(self, interface, type_class, is_lazy=False):
+        """
+        Registers ``type_class`` as the type to construct when resolving
+        ``interface``.
+
+        ``type_class`` can also be a dotted path string, like
+        ``"package.module:ClassName"``, in which case the module is imported
+        the first time the interface is resolved.
+
+        When ``is_lazy`` is set, resolving the interface returns a lightweight
+        proxy, and the object is only constructed the first time one of its
+        attributes is accessed. The same option is available for factories in
+        :meth:`register_factory`.
+
+        Singletons that depend on a previous registration are evicted as
+        described in :meth:`register_factory`.
+        """
+        evicted = self._evict_dependents(interface)
+        self._types[interface] = _TypeInfo(type_class=type_class, is_lazy=is_lazy)
+        self._invalidate_plans()
+        return evicted
+
+    def register_keyed(self, interface, key, builder, is_singleton=False):
+        """
+        Registers ``builder`` as the implementation of ``interface`` selected
+        by ``key``, so several implementations of the same interface can be
+        registered and resolved with :meth:`resolve`:
+
+        ..  code-block:: python
+
+            container.register_keyed('accounting', 'standard', StandardAccountingService)
+            container.register_keyed('accounting', 'QuickBooks', build_quickbooks_service)
+
+            service = container.resolve('accounting', key='QuickBooks')
+
+        When ``builder`` is a class, its constructor arguments are resolved
+        from the container like in :meth:`register_type`. Otherwise, it is
+        invoked with the container, or its ``build()`` method is if it is not
+        callable. ``builder`` can also be a dotted path string, like
+        ``"package.module:ClassName"``, imported the first time the key is
+        resolved. The object is created only once for each key and reused when
+        ``is_singleton`` is set.
+
+        Singletons that depend on a previous registration of the same key are
+        evicted as described in :meth:`register_factory`.
+        """
+        binding = KeyedBinding(interface, key)
+        evicted = self._evict_dependents(binding)
+        self._keyed[binding] = _KeyedInfo(builder=builder, is_singleton=is_singleton)
+        self._invalidate_plans()
+        return evicted
+
+    def register_pool(
+        self, interface, factory, min_size=0, max_size=None, idle_timeout=None, dispose=None
+    ):
+        """
+        Registers a pool of reusable objects created by invoking ``factory``
+        with the container. Pooled objects are not resolved, because they need
+        to be returned to the pool; they are borrowed with :meth:`acquire`.
+        See :class:`pythern.object_pool.ObjectPool` for a description of the
+        pool parameters.
+
+        Pooled objects are owned by the container. They are disposed with
+        ``dispose`` when they are evicted from the pool and when the container
+        is closed, or by invoking their ``close()`` method, if they have one,
+        when ``dispose`` is not specified. Registering a pool again closes the
+        pool it replaces, disposing its idle objects, and its objects in use
+        when they are released.
+        """
+        replaced = _get_local(self._pools).get(interface)
+        self._pools[interface] = ObjectPool(
+            functools.partial(factory, self),
+            min_size=min_size,
+            max_size=max_size,
+            idle_timeout=idle_timeout,
+            dispose=_dispose if dispose is None else dispose,
+        )
+        if replaced is not None:
+            replaced.close()
+
+    def acquire(self, interface, timeout=None):
+        """
+        Returns a context manager that borrows an object from the pool
+        registered for ``interface`` and returns it to the pool on exit:
+
+        ..  code-block:: python
 
-    def can_resolve(self, interface):
+            with container.acquire('parser') as parser:
+                parser.parse(document)
+
+        :raises ObjectTypeNotRegisteredError:
+            An exception is raised if no pool is registered for ``interface``.
+        :raises PoolExhaustedError:
+            An exception is raised if the pool is exhausted and no object is
+            returned to it before the specified ``timeout``.
+        """
+        return self._get_pool(interface).lease(timeout)
+
+    def pool_stats(self, interface):
+        """
+        Returns the :class:`pythern.object_pool.PoolStats` of the pool
+        registered for ``interface``.
+        """
+        return self._get_pool(interface).stats()
+
+    def evict_idle(self):
+        """
+        Evicts the idle pooled objects that exceeded the ``idle_timeout`` of
+        the pools registered in the container. Pools only evict objects when
+        they are acquired or released, so this method should be invoked
+        periodically to release the objects of pools that are not being used.
+
+        :return:
+            A dictionary with the number of objects evicted from each pool.
+        """
+        return {
+            interface: pool.evict_idle() for interface, pool in _get_local(self._pools).items()
+        }
+
+    def registered_interfaces(self):
+        """
+        Returns a list with the interfaces registered as instances, types or
+        factories, including the ones inherited from a parent container.
+        """
+        interfaces = list(self._instances)
+        interfaces.extend(
+            interface for interface in self._types if interface not in self._instances
+        )
+        registered = set(interfaces)
+        interfaces.extend(
+            interface for interface in self._factories if interface not in registered
+        )
+        return interfaces
+
+    def keyed_bindings(self):
+        """
+        Returns a list with a :class:`KeyedBinding` tuple for each
+        implementation registered with :meth:`register_keyed`, including the
+        ones inherited from a parent container.
+        """
+        return list(self._keyed)
+
+    def is_instrumented(self):
+        """
+        Returns whether instrumentation is enabled.
+        """
+        return "_resolve" in vars(self)
+
+    def can_resolve(self, interface, key=None):
         """ """
+        if key is not None:
+            return self._get_keyed_plan(KeyedBinding(interface, key)) is not _UNRESOLVABLE
         return (
             interface in self._instances
             or interface in self._types
@@ -34,42 +277,1271 @@ class Container:
             or self._can_resolve_type(interface)
         )
 
-    def resolve(self, interface):
-        """ """
+    def resolve(self, interface, key=None):
+        """
+        Resolves the specified ``interface``, or the implementation registered
+        for it with ``key`` in :meth:`register_keyed` if a key is specified.
+        """
+        if key is not None:
+            return self._resolve_keyed(KeyedBinding(interface, key), None)
+        return self._resolve(interface, None)
+
+    def resolve_many(self, interfaces):
+        """
+        Resolves all the specified ``interfaces`` in a single pass, and returns
+        the resolved objects in the same order. Dependencies shared by the
+        object graphs are built only once, as if all the interfaces were
+        resolved through the same :meth:`scope`.
+        """
+        with self.scope() as scope:
+            return [self._resolve(interface, scope) for interface in interfaces]
+
+    async def resolve_async(self, interface):
+        """
+        Resolves the specified ``interface`` like :meth:`resolve`, but awaits
+        the objects returned by asynchronous factories. The dependencies of a
+        type are resolved concurrently, and asynchronous singletons are awaited
+        only once even when several coroutines resolve them at the same time.
+        """
+        return await self._resolve_async(interface, None)
+
+    def compile(self, interface):
+        """
+        Returns a function that builds the object graph of ``interface`` with
+        direct constructor and factory calls, skipping the lookups that
+        :meth:`resolve` performs on every call. The function is generated
+        from the current registrations, so it should be compiled again if they
+        change. Singletons already created are embedded in the function, and
+        the remaining ones are still created only once.
+
+        ..  code-block:: python
+
+            create_handler = container.compile('handler')
+            handler = create_handler()
+        """
+        return _GraphCompiler(self).compile(interface)
+
+    def freeze(self):
+        """
+        Returns a :class:`FrozenContainer` with a snapshot of the current
+        registrations, optimized for applications that don't register anything
+        after startup.
+
+        :raises DependencyCycleError:
+            An exception is raised if the registered types depend on each other
+            in a cycle that could never be constructed.
+        """
+        return FrozenContainer(self)
+
+    def child(self):
+        """
+        Returns a new container that resolves everything registered in this
+        container, and in which registrations can be overridden without
+        affecting this one. Creating a child doesn't copy any registrations,
+        so it is cheap enough to create one per tenant or per test:
+
+        ..  code-block:: python
+
+            tenant = container.child()
+            tenant.register_instance('settings', tenant_settings)
+            handler = tenant.resolve('handler')
+
+        Registrations made later in this container are also visible to the
+        child, unless overridden. Singletons registered in this container are
+        created and owned by this container and shared with all its children,
+        so they are built from its registrations and not from the overrides.
+        """
+        child = Container()
+        child._parent = self
+        child._factories = ChainMap({}, self._factories)
+        child._instances = ChainMap({}, self._instances)
+        child._types = ChainMap({}, self._types)
+        child._pools = ChainMap({}, self._pools)
+        child._keyed = ChainMap({}, self._keyed)
+        child._keyed_instances = ChainMap({}, self._keyed_instances)
+        # Constructor arguments and imported objects don't depend on the
+        # registrations.
+        child._type_arguments = self._type_arguments
+        child._imported = self._imported
+        if self._children is None:
+            self._children = weakref.WeakSet()
+        self._children.add(child)
+        return child
+
+    def scope(self):
+        """
+        Returns a new :class:`Scope` that shares the objects it resolves across
+        all the injection sites of the graphs resolved through it. The scope
+        is intended to be used as a context manager, and it drops the objects
+        it holds on exit:
+
+        ..  code-block:: python
+
+            with container.scope() as scope:
+                handler = scope.resolve('handler')
+        """
+        return Scope(self)
+
+    def warm_up(self, max_workers=None):
+        """
+        Builds every singleton factory, fills every pool up to its minimum size
+        and prepares the resolution plans of every registered type ahead of the
+        first resolution. Registrations are warmed up following their
+        dependency graph, so a registration starts once the registrations it
+        depends on are ready, and independent branches are warmed up in
+        parallel on a thread pool. Containers with asynchronous singleton
+        factories are warmed up with :meth:`warm_up_async`.
+
+        :param int max_workers:
+            Maximum number of threads used. The default of
+            :class:`concurrent.futures.ThreadPoolExecutor` is used if not
+            specified.
+
+        :return:
+            A dictionary with the time in seconds that it took to warm up each
+            registered interface.
+        """
+        durations, errors, _, _ = _run_in_dependency_order(
+            self._get_warm_up_dependencies(), self._warm_up_interface, max_workers
+        )
+        if errors:
+            raise next(iter(errors.values()))
+        return durations
+
+    async def warm_up_async(self):
+        """
+        Warms up the container like :meth:`warm_up`, but builds the singletons
+        with :meth:`resolve_async`, so asynchronous factories are awaited.
+        Independent branches are warmed up concurrently in the event loop, and
+        pools are filled in its default executor.
+
+        :return:
+            A dictionary with the time in seconds that it took to warm up each
+            registered interface.
+        """
+        durations, errors, _, _ = await _run_in_dependency_order_async(
+            self._get_warm_up_dependencies(), self._warm_up_interface_async
+        )
+        if errors:
+            raise next(iter(errors.values()))
+        return durations
+
+    def close(self, timeout=None, max_workers=None):
+        """
+        Disposes the singletons created by the container by invoking their
+        ``close()`` method, if they have one. Singletons are closed before the
+        singletons they depend on, and independent branches are closed in
+        parallel on a thread pool. Closed singletons are removed from the
+        container, so they would be created again if resolved. Registered
+        instances are not owned by the container and are not closed.
+
+        The idle objects of the pools registered in the container are disposed
+        too, before any singleton, because they might use them. Pooled objects
+        that are in use are not disposed; they are returned to their pool when
+        released and disposed the next time the container is closed.
+
+        :param float timeout:
+            Number of seconds to wait for the singletons to close, or ``None``
+            to wait until all of them are closed.
+        :param int max_workers:
+            Maximum number of threads used.
+
+        :return:
+            A :class:`DisposalReport` with the time in seconds it took to close
+            each singleton and pool, the exceptions raised closing them, and
+            the interfaces that were not closed before the ``timeout``. Pending
+            singletons that started closing keep closing in the background and
+            are removed from the container too; the ones that didn't start
+            are kept and are not closed.
+        """
+        owned = dict(self._owned)
+        pools = dict(_get_local(self._pools))
+        durations, errors, pending, started = _run_in_dependency_order(
+            self._get_disposal_dependencies(owned, pools),
+            lambda interface: _dispose_resource(interface, owned, pools),
+            max_workers,
+            timeout,
+        )
+        self._forget_owned(owned, set(pending).difference(started))
+        return DisposalReport(durations, errors, pending)
+
+    async def aclose(self, timeout=None):
+        """
+        Disposes the singletons created by the container like :meth:`close`,
+        but awaits their ``aclose()`` method if they have one. Synchronous
+        ``close()`` methods are invoked in the default executor of the event
+        loop, so independent branches are closed concurrently. Pools are
+        drained in the default executor with their synchronous ``dispose``.
+        """
+        owned = dict(self._owned)
+        pools = dict(_get_local(self._pools))
+        durations, errors, pending, started = await _run_in_dependency_order_async(
+            self._get_disposal_dependencies(owned, pools),
+            lambda interface: _dispose_resource_async(interface, owned, pools),
+            timeout,
+        )
+        self._forget_owned(owned, set(pending).difference(started))
+        return DisposalReport(durations, errors, pending)
+
+    def enable_instrumentation(self):
+        """
+        Starts recording, for each interface, how many times it is resolved,
+        how many of those resolutions were served from an existing object,
+        and the total and maximum time spent constructing it. Construction
+        times include the construction of dependencies. Recording also enables
+        the hooks added with :meth:`add_construction_hooks`. Only objects that
+        are actually constructed are recorded as constructions; singletons,
+        weak singletons and lazy proxies served without running a factory or
+        constructor are cache hits. Functions created with :meth:`compile`
+        only record the singletons they construct.
+
+        Instrumentation is disabled by default, and it adds no overhead to
+        the resolution until it is enabled.
+        """
+        if self._instrumentation is None:
+            self._instrumentation = _Instrumentation()
+        self._resolve = self._resolve_instrumented
+        self._resolve_keyed = self._resolve_keyed_instrumented
+        self._construct = self._construct_instrumented
+        self._create_instance = self._create_instance_instrumented
+        self._resolve_async = self._resolve_async_instrumented
+        self._construct_async = self._construct_async_instrumented
+
+    def disable_instrumentation(self):
+        """
+        Stops recording statistics and invoking construction hooks. The
+        statistics recorded so far are still available from :meth:`stats`.
+        """
+        for name in (
+            "_resolve",
+            "_resolve_keyed",
+            "_construct",
+            "_create_instance",
+            "_resolve_async",
+            "_construct_async",
+        ):
+            self.__dict__.pop(name, None)
+
+    def stats(self):
+        """
+        Returns a snapshot of the statistics recorded since instrumentation
+        was first enabled.
+
+        :return:
+            A dictionary mapping each resolved interface to a
+            :class:`ResolutionStats` tuple. Keyed bindings are mapped by their
+            :class:`KeyedBinding`.
+        """
+        if self._instrumentation is None:
+            return {}
+        return self._instrumentation.snapshot()
+
+    def add_construction_hooks(self, pre_construction=None, post_construction=None):
+        """
+        Adds callbacks invoked around the construction of every object while
+        instrumentation is enabled. ``pre_construction(interface)`` is invoked
+        before an object is constructed, and
+        ``post_construction(interface, instance, seconds)`` after it has been
+        constructed successfully.
+        """
+        if self._instrumentation is None:
+            self._instrumentation = _Instrumentation()
+        self._instrumentation.add_hooks(pre_construction, post_construction)
+
+    def remove_construction_hooks(self, pre_construction=None, post_construction=None):
+        """
+        Removes callbacks previously added with :meth:`add_construction_hooks`.
+        """
+        if self._instrumentation is not None:
+            self._instrumentation.remove_hooks(pre_construction, post_construction)
+
+    def _get_disposal_dependencies(self, owned, pools):
+        # A singleton can be closed once all the singletons that depend on it,
+        # directly or through other objects, have been closed. Pooled objects
+        # are created on demand, so their dependencies are not recorded, and
+        # pools are closed before all the singletons.
+        dependents = {interface: set() for interface in owned}
+        for interface in owned:
+            for dependency in self._get_transitive_dependencies(interface):
+                if dependency in dependents and dependency != interface:
+                    dependents[dependency].add(interface)
+            dependents[interface].update(pool for pool in pools if pool != interface)
+        for interface in pools:
+            dependents.setdefault(interface, set())
+        return dependents
+
+    def _get_transitive_dependencies(self, interface):
+        return _get_reachable(self._dependencies, interface)
+
+    def _evict_dependents(self, *interfaces):
+        # The reverse index only contains the singletons created since the
+        # dependencies were recorded, so evicting is proportional to the
+        # number of dependents rather than to the size of the container.
+        evicted = []
+        if self._owned or self._weak_instances:
+            dependents = set(interfaces)
+            for interface in interfaces:
+                dependents.update(_get_reachable(self._dependents, interface))
+            for dependent in dependents:
+                instance = self._owned.pop(dependent, _MISSING)
+                if instance is not _MISSING:
+                    self._instances.pop(dependent, None)
+                    self._keyed_instances.pop(dependent, None)
+                    evicted.append(Eviction(self, dependent, instance))
+                reference = self._weak_instances.pop(dependent, None)
+                instance = None if reference is None else reference()
+                if instance is not None:
+                    evicted.append(Eviction(self, dependent, instance))
+                self._forget_dependencies(dependent)
+        if self._children is None:
+            return evicted
+        # Children might depend on the evicted singletons of this container,
+        # and not only on the interfaces registered again.
+        changed = set(interfaces)
+        changed.update(eviction.interface for eviction in evicted)
+        evicted_by_children = []
+        for child in list(self._children):
+            evicted_by_children.extend(child._evict_dependents(*changed))
+        return evicted_by_children + evicted
+
+    def _forget_dependencies(self, interface):
+        for dependency in self._dependencies.pop(interface, ()):
+            dependents = self._dependents.get(dependency)
+            if dependents is not None:
+                dependents.discard(interface)
+                if not dependents:
+                    del self._dependents[dependency]
+
+    def _forget_owned(self, owned, kept):
+        for interface in owned:
+            if interface not in kept:
+                self._owned.pop(interface, None)
+                self._instances.pop(interface, None)
+                self._keyed_instances.pop(interface, None)
+        self._invalidate_plans()
+
+    @contextlib.contextmanager
+    def _recording_dependencies(self, interface):
+        with self._recording_lock:
+            self._recording += 1
+        token = _construction_owner.set((self, interface))
+        try:
+            yield
+        finally:
+            _construction_owner.reset(token)
+            with self._recording_lock:
+                self._recording -= 1
+
+    def _record_dependency(self, interface):
+        owner = _construction_owner.get()
+        if owner is not None and owner[0] is self and owner[1] != interface:
+            self._dependencies.setdefault(owner[1], set()).add(interface)
+            self._dependents.setdefault(interface, set()).add(owner[1])
+
+    def _get_pool(self, interface):
+        pool = self._pools.get(interface)
+        if pool is None:
+            raise ObjectTypeNotRegisteredError(interface)
+        return pool
+
+    def _get_warm_up_dependencies(self):
+        interfaces = set(self._types)
+        interfaces.update(
+            interface
+            for interface, factory_info in self._factories.items()
+            if factory_info.is_singleton
+            and not factory_info.is_weak
+            and interface not in self._instances
+        )
+        dependencies = {
+            interface: interfaces.intersection(self._get_plan(interface).arguments)
+            for interface in interfaces
+        }
+        for interface in self._pools:
+            dependencies.setdefault(interface, set())
+        return dependencies
+
+    def _warm_up_interface(self, interface):
+        if self._get_plan(interface).registry is _FACTORY:
+            self.resolve(interface)
+        if interface in self._pools:
+            self._pools[interface].fill()
+
+    async def _warm_up_interface_async(self, interface):
+        if self._get_plan(interface).registry is _FACTORY:
+            await self.resolve_async(interface)
+        if interface in self._pools:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._pools[interface].fill
+            )
+
+    def _resolve(self, interface, scope):
+        if self._recording:
+            self._record_dependency(interface)
+        plan = self._plans.get(interface)
+        if plan is None:
+            plan = self._plans[interface] = self._create_plan(interface)
+        if plan.registry is _INSTANCE:
+            return plan.target
+        if scope is None:
+            return self._build(interface, plan, None)
+        instance = scope._instances.get(interface, _MISSING)
+        if instance is _MISSING:
+            instance = self._build(interface, plan, scope)
+            scope._instances[interface] = instance
+        return instance
+
+    def _build(self, interface, plan, scope):
+        if plan.registry is _FACTORY:
+            return self._create_instance_from_factory(interface, plan.target, scope)
+        if plan.registry is _TYPE:
+            return self._create_instance(interface, plan, scope)
+        if plan.registry is _LAZY:
+            return _LazyProxy(functools.partial(self._build, interface, plan.target, scope))
+        return None
+
+    async def _resolve_async(self, interface, scope):
+        if self._recording:
+            self._record_dependency(interface)
+        plan = self._get_plan(interface)
+        if plan.registry is _INSTANCE:
+            return plan.target
+        if scope is None:
+            return await self._build_async(interface, plan, None)
+        instance = scope._instances.get(interface, _MISSING)
+        if instance is not _MISSING:
+            return instance
+        return await _await_once(
+            scope._pending, interface, lambda: self._build_scoped_async(interface, plan, scope)
+        )
+
+    async def _build_async(self, interface, plan, scope):
+        if plan.registry is _FACTORY:
+            return await self._create_instance_from_factory_async(
+                interface, plan.target, scope
+            )
+        if plan.registry is _TYPE:
+            return await self._construct_async(
+                interface, self._create_instance_async, plan, scope
+            )
+        if plan.registry is _LAZY:
+            # Attribute access is synchronous, so lazy objects are built with
+            # the synchronous resolution when they are first used.
+            return _LazyProxy(functools.partial(self._build, interface, plan.target, scope))
+        return None
+
+    async def _build_scoped_async(self, interface, plan, scope):
+        instance = await self._build_async(interface, plan, scope)
+        scope._instances[interface] = instance
+        return instance
+
+    def _resolve_instrumented(self, interface, scope):
+        self._instrumentation.record_resolution(interface)
+        return Container._resolve(self, interface, scope)
+
+    def _construct(self, interface, create, *arguments):
+        # Factories are invoked through this method, and types constructed
+        # with _create_instance, so that both can be replaced to record the
+        # constructions while instrumented.
+        return create(*arguments)
+
+    async def _construct_async(self, interface, create, *arguments):
+        return await _await_result(create(*arguments))
+
+    def _create_instance_instrumented(self, interface, plan, scope):
+        return self._construct_instrumented(
+            interface, Container._create_instance, self, interface, plan, scope
+        )
+
+    def _construct_instrumented(self, interface, create, *arguments):
+        instrumentation = self._instrumentation
+        instrumentation.pre_construction(interface)
+        start = time.perf_counter()
+        try:
+            instance = create(*arguments)
+        finally:
+            elapsed = time.perf_counter() - start
+            instrumentation.record_construction(interface, elapsed)
+        instrumentation.post_construction(interface, instance, elapsed)
+        return instance
+
+    def _resolve_keyed_instrumented(self, binding, scope):
+        self._instrumentation.record_resolution(binding)
+        return Container._resolve_keyed(self, binding, scope)
+
+    async def _resolve_async_instrumented(self, interface, scope):
+        self._instrumentation.record_resolution(interface)
+        return await Container._resolve_async(self, interface, scope)
+
+    async def _construct_async_instrumented(self, interface, create, *arguments):
+        instrumentation = self._instrumentation
+        instrumentation.pre_construction(interface)
+        start = time.perf_counter()
+        try:
+            instance = await _await_result(create(*arguments))
+        finally:
+            elapsed = time.perf_counter() - start
+            instrumentation.record_construction(interface, elapsed)
+        instrumentation.post_construction(interface, instance, elapsed)
+        return instance
+
+    def _get_plan(self, interface):
+        plan = self._plans.get(interface)
+        if plan is None:
+            plan = self._plans[interface] = self._create_plan(interface)
+        return plan
+
+    def _resolve_keyed(self, binding, scope):
+        if self._recording:
+            self._record_dependency(binding)
+        plan = self._get_keyed_plan(binding)
+        if plan.registry is _INSTANCE:
+            return plan.target
+        if plan is _UNRESOLVABLE:
+            return None
+        if self._keyed[binding].is_singleton:
+            return self._create_keyed_singleton(binding, plan)
+        if scope is None:
+            return self._create_keyed(binding, plan, None)
+        instance = scope._instances.get(binding, _MISSING)
+        if instance is _MISSING:
+            instance = scope._instances[binding] = self._create_keyed(binding, plan, scope)
+        return instance
+
+    def _get_keyed_plan(self, binding):
+        plan = self._keyed_plans.get(binding)
+        if plan is None:
+            plan = self._keyed_plans[binding] = self._create_keyed_plan(binding)
+        return plan
+
+    def _create_keyed_plan(self, binding):
+        # Keyed singletons are served from an instance plan once created, so
+        # resolving them is a single lookup.
+        keyed_info = self._keyed.get(binding)
+        if keyed_info is None:
+            return _UNRESOLVABLE
+        instance = self._keyed_instances.get(binding, _MISSING)
+        if instance is not _MISSING:
+            return _ResolutionPlan(_INSTANCE, instance, ())
+        builder = self._import(keyed_info.builder)
+        if isinstance(builder, type):
+            return self._create_type_plan(builder)
+        return _ResolutionPlan(_FACTORY, builder if callable(builder) else builder.build, ())
+
+    def _create_keyed_singleton(self, binding, plan):
+        owner = self._get_owner(binding, "_keyed")
+        with owner._get_lock(binding):
+            instance = owner._keyed_instances.get(binding, _MISSING)
+            if instance is _MISSING:
+                if owner is not self:
+                    plan = owner._get_keyed_plan(binding)
+                with owner._recording_dependencies(binding):
+                    instance = _check_synchronous(
+                        binding, self._construct(binding, owner._build_keyed, binding, plan)
+                    )
+                owner._owned[binding] = instance
+                owner._keyed_instances[binding] = instance
+                owner._forget_plan(binding)
+        return instance
+
+    def _create_keyed(self, binding, plan, scope):
+        if plan.registry is _TYPE:
+            return self._create_instance(binding, plan, scope)
+        return self._construct(binding, plan.target, self if scope is None else scope)
+
+    def _build_keyed(self, binding, plan):
+        # Builds a keyed singleton owned by this container. The construction
+        # is recorded by the container that resolves it.
+        if plan.registry is _TYPE:
+            return Container._create_instance(self, binding, plan, None)
+        return plan.target(self)
+
+    def _invalidate_plans(self):
+        self._plans.clear()
+        self._keyed_plans.clear()
+        self._resolvable.clear()
+        if self._children is not None:
+            for child in list(self._children):
+                child._invalidate_plans()
+
+    def _create_plan(self, interface):
+        # The plan records which registry serves the interface and, for types,
+        # the constructor arguments, so introspection happens only once per
+        # interface until the registrations change. Types that cannot be
+        # resolved get a negative plan, so they are not checked again.
         if interface in self._instances:
-            return self._instances.get(interface)
+            return _ResolutionPlan(_INSTANCE, self._instances[interface], ())
         if interface in self._types:
-            type_class = self._types.get(interface)
-            return self._create_instance(type_class)
+            type_info = self._types[interface]
+            plan = self._create_type_plan(self._import(type_info.type_class))
+            if type_info.is_lazy and plan is not _UNRESOLVABLE:
+                return _ResolutionPlan(_LAZY, plan, plan.arguments)
+            return plan
         if interface in self._factories:
-            return self._create_instance_from_factory(interface)
-        return self._create_instance(interface)
-
-    def _create_instance(self, type_class):
-        if self.can_resolve(type_class):
-            instances = self._collect_type_arguments(type_class, self.resolve)
-            return type_class(*instances)
-
-    def _create_instance_from_factory(self, interface):
-        factory_info = self._factories.get(interface)
-        instance = factory_info.factory(self)
-        if factory_info.is_singleton:
-            self._instances[interface] = instance
+            factory_info = self._factories[interface]
+            plan = _ResolutionPlan(_FACTORY, factory_info, ())
+            if factory_info.is_lazy:
+                return _ResolutionPlan(_LAZY, plan, ())
+            return plan
+        return self._create_type_plan(interface)
+
+    def _import(self, target):
+        # Imported objects are cached apart from the registrations, so that
+        # resolving through a child doesn't add overrides to its own layer.
+        if not isinstance(target, str):
+            return target
+        imported = self._imported.get(target)
+        if imported is None:
+            imported = self._imported[target] = import_object(target)
+        return imported
+
+    def _create_type_plan(self, type_class):
+        if not self._can_resolve_type(type_class):
+            return _UNRESOLVABLE
+        return _ResolutionPlan(_TYPE, type_class, self._get_type_arguments(type_class))
+
+    async def _create_instance_async(self, plan, scope):
+        instances = await asyncio.gather(
+            *[self._resolve_async(argument, scope) for argument in plan.arguments]
+        )
+        return plan.target(*instances)
+
+    def _create_instance(self, interface, plan, scope):
+        # Resolvability of the whole subtree was established when the plan was
+        # created, so arguments are resolved directly from their own plans.
+        instances = [self._resolve(argument, scope) for argument in plan.arguments]
+        return plan.target(*instances)
+
+    def _create_instance_from_factory(self, interface, factory_info, scope):
+        if not factory_info.is_singleton and not factory_info.is_weak:
+            # Transient factories receive the scope, so their own dependencies
+            # are shared with the rest of the scope.
+            return self._construct(
+                interface, factory_info.factory, self if scope is None else scope
+            )
+        owner = self._get_owner(interface, "_factories")
+        if factory_info.is_weak:
+            return self._get_weak_instance(owner, interface, factory_info)
+        instance = owner._instances.get(interface, _MISSING)
+        if instance is not _MISSING:
+            return instance
+        with owner._get_lock(interface):
+            # Another thread might have created the singleton while this one
+            # was waiting for the lock.
+            instance = owner._instances.get(interface, _MISSING)
+            if instance is _MISSING:
+                with owner._recording_dependencies(interface):
+                    instance = _check_synchronous(
+                        interface, self._construct(interface, factory_info.factory, owner)
+                    )
+                owner._store_owned(interface, instance)
+        return instance
+
+    def _get_weak_instance(self, owner, interface, factory_info):
+        reference = owner._weak_instances.get(interface)
+        instance = None if reference is None else reference()
+        if instance is None:
+            with owner._get_lock(interface):
+                reference = owner._weak_instances.get(interface)
+                instance = None if reference is None else reference()
+                if instance is None:
+                    with owner._recording_dependencies(interface):
+                        instance = _check_synchronous(
+                            interface, self._construct(interface, factory_info.factory, owner)
+                        )
+                    owner._weak_instances[interface] = weakref.ref(instance)
         return instance
 
+    async def _create_instance_from_factory_async(self, interface, factory_info, scope):
+        if not factory_info.is_singleton and not factory_info.is_weak:
+            return await self._construct_async(
+                interface, factory_info.factory, self if scope is None else scope
+            )
+        owner = self._get_owner(interface, "_factories")
+        if factory_info.is_weak:
+            reference = owner._weak_instances.get(interface)
+            instance = None if reference is None else reference()
+            if instance is not None:
+                return instance
+            return await _await_once(
+                owner._pending,
+                interface,
+                lambda: self._create_weak_async(owner, interface, factory_info),
+            )
+        instance = owner._instances.get(interface, _MISSING)
+        if instance is not _MISSING:
+            return instance
+        return await _await_once(
+            owner._pending,
+            interface,
+            lambda: self._create_singleton_async(owner, interface, factory_info),
+        )
+
+    async def _create_singleton_async(self, owner, interface, factory_info):
+        instance = owner._instances.get(interface, _MISSING)
+        if instance is _MISSING:
+            with owner._recording_dependencies(interface):
+                instance = await self._construct_async(interface, factory_info.factory, owner)
+            owner._store_owned(interface, instance)
+        return instance
+
+    def _store_owned(self, interface, instance):
+        self._owned[interface] = instance
+        self._instances[interface] = instance
+        self._forget_plan(interface)
+
+    def _forget_plan(self, interface):
+        # Children resolving a singleton owned by this container are left with
+        # a plan that builds it through this container, so their plans are
+        # dropped too and recreated as instance plans.
+        self._plans.pop(interface, None)
+        self._keyed_plans.pop(interface, None)
+        if self._children is not None:
+            for child in list(self._children):
+                child._forget_plan(interface)
+
+    async def _create_weak_async(self, owner, interface, factory_info):
+        with owner._recording_dependencies(interface):
+            instance = await self._construct_async(interface, factory_info.factory, owner)
+        owner._weak_instances[interface] = weakref.ref(instance)
+        return instance
+
+    def _get_owner(self, interface, registry):
+        # Singletons inherited from a parent are owned by the container where
+        # they are registered, so they are shared with all its children. They
+        # are still constructed through the requesting container, which
+        # records the construction when instrumented.
+        owner = self
+        while owner._parent is not None and interface not in getattr(owner, registry).maps[0]:
+            owner = owner._parent
+        return owner
+
+    def _get_lock(self, interface):
+        lock = self._locks.get(interface)
+        if lock is None:
+            lock = self._locks.setdefault(interface, threading.RLock())
+        return lock
+
     def _can_resolve_type(self, type_class):
-        return (
-            self._can_arguments_be_resolved(type_class)
-            if isinstance(type_class, type)
-            else False
+        if not isinstance(type_class, type):
+            return False
+        resolvable = self._resolvable.get(type_class)
+        if resolvable is None:
+            resolvable = all(
+                self.can_resolve(argument)
+                for argument in self._get_type_arguments(type_class)
+            )
+            self._resolvable[type_class] = resolvable
+        return resolvable
+
+    def _get_type_arguments(self, type_class):
+        if not isinstance(type_class, type):
+            return ()
+        type_arguments = self._type_arguments.get(type_class)
+        if type_arguments is None:
+            type_arguments = tuple(inspect.getfullargspec(type_class.__init__).args[1:])
+            self._type_arguments[type_class] = type_arguments
+        return type_arguments
+
+
+class FrozenContainer:
+    """
+    Immutable, read-optimized snapshot of the registrations of a
+    :class:`Container`, created with :meth:`Container.freeze`. Every registered
+    interface is mapped to a generated constructor in a single lookup table, so
+    resolving is one dictionary lookup and one call, and the container can be
+    used concurrently without locks. Factories are invoked with a private
+    container holding the snapshot, and the snapshot owns its singletons.
+    Unregistered types are compiled the first time they are resolved.
+    """
+
+    def __init__(self, container):
+        snapshot = Container()
+        snapshot._instances = dict(container._instances)
+        snapshot._types = dict(container._types)
+        snapshot._factories = dict(container._factories)
+        snapshot._keyed = dict(container._keyed)
+        snapshot._keyed_instances = dict(container._keyed_instances)
+        interfaces = set(snapshot._instances)
+        interfaces.update(snapshot._types)
+        interfaces.update(snapshot._factories)
+        _check_dependency_cycles(snapshot, interfaces)
+        self._snapshot = snapshot
+        self._constructors = {
+            interface: snapshot.compile(interface) for interface in interfaces
+        }
+
+    def can_resolve(self, interface, key=None):
+        """
+        Returns whether the specified ``interface`` can be resolved.
+        """
+        return self._snapshot.can_resolve(interface, key)
+
+    def resolve(self, interface, key=None):
+        """
+        Resolves the specified ``interface`` like :meth:`Container.resolve`.
+        Keyed bindings are resolved from their resolution plans, which serve
+        singletons with a single lookup once they are created.
+        """
+        if key is not None:
+            return self._snapshot._resolve_keyed(KeyedBinding(interface, key), None)
+        constructor = self._constructors.get(interface)
+        if constructor is None:
+            # Adding the constructor of an unregistered type replaces a single
+            # dictionary entry, which is safe for concurrent readers.
+            constructor = self._snapshot.compile(interface)
+            self._constructors[interface] = constructor
+        return constructor()
+
+
+class DependencyCycleError(ValueError):
+    """
+    Exception class used to report registered types that depend on each other
+    in a cycle. The ``cycle`` attribute contains the interfaces in the cycle,
+    starting and ending with the same interface.
+    """
+
+    def __init__(self, cycle):
+        super().__init__(" -> ".join(repr(interface) for interface in cycle))
+        self.cycle = cycle
+
+
+def _check_dependency_cycles(container, interfaces):
+    # Depth first search over the constructor arguments of the plans. Lazy
+    # registrations are not followed, because their proxies break the cycle.
+    visited = set()
+    for root in interfaces:
+        if root in visited:
+            continue
+        path = [root]
+        on_path = {root}
+        stack = [iter(_get_plan_dependencies(container, root))]
+        while stack:
+            dependency = next(stack[-1], _MISSING)
+            if dependency is _MISSING:
+                stack.pop()
+                finished = path.pop()
+                on_path.discard(finished)
+                visited.add(finished)
+                continue
+            if dependency in on_path:
+                cycle = path[path.index(dependency):] + [dependency]
+                raise DependencyCycleError(cycle)
+            if dependency not in visited:
+                path.append(dependency)
+                on_path.add(dependency)
+                stack.append(iter(_get_plan_dependencies(container, dependency)))
+
+
+def _get_plan_dependencies(container, interface):
+    plan = container._get_plan(interface)
+    return plan.arguments if plan.registry is _TYPE else ()
+
+
+def _get_reachable(edges, start):
+    visited = set()
+    stack = [start]
+    while stack:
+        for node in edges.get(stack.pop(), ()):
+            if node not in visited:
+                visited.add(node)
+                stack.append(node)
+    return visited
+
+
+def _run_in_dependency_order(dependencies, run, max_workers=None, timeout=None):
+    # Runs ``run(node)`` on a thread pool for every node in ``dependencies``
+    # once all the nodes it depends on have finished. Returns the duration of
+    # each node, the exceptions raised, the nodes not finished before the
+    # timeout, and which of those had already started. Nodes submitted but not
+    # started when the timeout expires are cancelled, so they never run.
+    dependencies = {node: set(pending) for node, pending in dependencies.items()}
+    deadline = None if timeout is None else time.perf_counter() + timeout
+    durations = {}
+    errors = {}
+    running = {}
+    executor = futures.ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        while dependencies or running:
+            ready = [node for node, pending in dependencies.items() if not pending]
+            if not ready and not running:
+                # The remaining nodes depend on each other, so there is no
+                # order to honor.
+                ready = list(dependencies)
+            for node in ready:
+                del dependencies[node]
+                running[executor.submit(_timed, run, node)] = node
+            remaining = None if deadline is None else deadline - time.perf_counter()
+            done, _ = futures.wait(
+                running, timeout=remaining, return_when=futures.FIRST_COMPLETED
+            )
+            if not done:
+                break
+            for future in done:
+                node = running.pop(future)
+                try:
+                    durations[node] = future.result()
+                except Exception as error:
+                    errors[node] = error
+                for pending in dependencies.values():
+                    pending.discard(node)
+    finally:
+        started = [node for future, node in running.items() if not future.cancel()]
+        executor.shutdown(wait=not running)
+    return durations, errors, list(running.values()) + list(dependencies), started
+
+
+async def _run_in_dependency_order_async(dependencies, run, timeout=None):
+    # Same as _run_in_dependency_order(), but ``run(node)`` returns an
+    # awaitable and the nodes run concurrently in the event loop. Nodes
+    # running when the timeout expires are cancelled, but they had already
+    # started.
+    dependencies = {node: set(pending) for node, pending in dependencies.items()}
+    deadline = None if timeout is None else time.perf_counter() + timeout
+    durations = {}
+    errors = {}
+    running = {}
+    while dependencies or running:
+        ready = [node for node, pending in dependencies.items() if not pending]
+        if not ready and not running:
+            ready = list(dependencies)
+        for node in ready:
+            del dependencies[node]
+            running[asyncio.ensure_future(_timed_async(run, node))] = node
+        remaining = None if deadline is None else deadline - time.perf_counter()
+        done, _ = await asyncio.wait(
+            running, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
         )
+        if not done:
+            for task in running:
+                task.cancel()
+            break
+        for task in done:
+            node = running.pop(task)
+            try:
+                durations[node] = task.result()
+            except Exception as error:
+                errors[node] = error
+            for pending in dependencies.values():
+                pending.discard(node)
+    started = list(running.values())
+    return durations, errors, started + list(dependencies), started
+
+
+def _timed(run, node):
+    start = time.perf_counter()
+    run(node)
+    return time.perf_counter() - start
+
+
+async def _timed_async(run, node):
+    start = time.perf_counter()
+    await run(node)
+    return time.perf_counter() - start
+
+
+def _get_local(registry):
+    # Registries of child containers are layered over the registries of their
+    # parent, and only the first layer belongs to the child.
+    return registry.maps[0] if isinstance(registry, ChainMap) else registry
+
+
+def _dispose_resource(interface, owned, pools):
+    if interface in pools:
+        pools[interface].drain()
+    if interface in owned:
+        _dispose(owned[interface])
+
+
+async def _dispose_resource_async(interface, owned, pools):
+    if interface in pools:
+        await asyncio.get_running_loop().run_in_executor(None, pools[interface].drain)
+    if interface in owned:
+        await _dispose_async(owned[interface])
+
+
+def _dispose(instance):
+    close = getattr(instance, "close", None)
+    if callable(close):
+        close()
+
+
+async def _dispose_async(instance):
+    close = getattr(instance, "aclose", None)
+    if callable(close):
+        await close()
+        return
+    close = getattr(instance, "close", None)
+    if callable(close):
+        result = await asyncio.get_running_loop().run_in_executor(None, close)
+        await _await_result(result)
 
-    def _can_arguments_be_resolved(self, type_class):
-        can_resolve_arguments = self._collect_type_arguments(
-            type_class, self.can_resolve
+
+def _check_synchronous(interface, instance):
+    # Shared objects returned by asynchronous factories can only be awaited
+    # once, so they are never cached by the synchronous resolution.
+    if inspect.isawaitable(instance):
+        if inspect.iscoroutine(instance):
+            instance.close()
+        raise TypeError(
+            f"The factory of {interface!r} is asynchronous and must be resolved "
+            "with resolve_async()"
         )
-        return False not in can_resolve_arguments
+    return instance
+
+
+async def _await_result(result):
+    if inspect.isawaitable(result):
+        return await result
+    return result
+
+
+async def _await_once(pending, key, create_coroutine):
+    # All the coroutines that need the object while it is being built wait on
+    # the same task, which is shielded so cancelling one of them does not
+    # cancel the construction for the others.
+    task = pending.get(key)
+    if task is None:
+        task = pending[key] = asyncio.ensure_future(create_coroutine())
+        task.add_done_callback(lambda _: pending.pop(key, None))
+    return await asyncio.shield(task)
+
+
+class _Instrumentation:
+    # Statistics are kept as [resolutions, constructions, total_time, max_time]
+    # lists per interface and updated under a lock, because resolutions
+    # happen concurrently.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._statistics = {}
+        self._pre_construction_hooks = []
+        self._post_construction_hooks = []
+
+    def add_hooks(self, pre_construction, post_construction):
+        if pre_construction is not None:
+            self._pre_construction_hooks.append(pre_construction)
+        if post_construction is not None:
+            self._post_construction_hooks.append(post_construction)
+
+    def remove_hooks(self, pre_construction, post_construction):
+        if pre_construction in self._pre_construction_hooks:
+            self._pre_construction_hooks.remove(pre_construction)
+        if post_construction in self._post_construction_hooks:
+            self._post_construction_hooks.remove(post_construction)
+
+    def record_resolution(self, interface):
+        with self._lock:
+            self._get_statistics(interface)[0] += 1
+
+    def record_construction(self, interface, elapsed):
+        with self._lock:
+            statistics = self._get_statistics(interface)
+            statistics[1] += 1
+            statistics[2] += elapsed
+            statistics[3] = max(statistics[3], elapsed)
+
+    def _get_statistics(self, interface):
+        statistics = self._statistics.get(interface)
+        if statistics is None:
+            statistics = self._statistics[interface] = [0, 0, 0.0, 0.0]
+        return statistics
+
+    def pre_construction(self, interface):
+        for hook in self._pre_construction_hooks:
+            hook(interface)
+
+    def post_construction(self, interface, instance, elapsed):
+        for hook in self._post_construction_hooks:
+            hook(interface, instance, elapsed)
+
+    def snapshot(self):
+        snapshot = {}
+        with self._lock:
+            for interface, statistics in self._statistics.items():
+                resolutions, constructions, total_time, max_time = statistics
+                snapshot[interface] = ResolutionStats(
+                    resolutions=resolutions,
+                    cache_hits=max(resolutions - constructions, 0),
+                    constructions=constructions,
+                    total_time=total_time,
+                    max_time=max_time,
+                )
+        return snapshot
+
+
+class _GraphCompiler:
+    # Generates the source of a function that builds an object graph. Every
+    # object in the graph is assigned to a local variable in construction
+    # order, so deep graphs do not produce deeply nested expressions.
+
+    def __init__(self, container):
+        self._container = container
+        self._namespace = {"_LazyProxy": _LazyProxy}
+        self._lines = []
+
+    def compile(self, interface):
+        result = self._emit(interface)
+        body = "".join(f"    {line}\n" for line in self._lines)
+        source = f"def resolve():\n{body}    return {result}\n"
+        exec(source, self._namespace)
+        function = self._namespace["resolve"]
+        function.__qualname__ = f"compiled_resolve({interface!r})"
+        return function
+
+    def _emit(self, interface):
+        plan = self._container._get_plan(interface)
+        if plan.registry is _INSTANCE:
+            return self._bind(plan.target)
+        if plan.registry is _TYPE:
+            arguments = ", ".join(self._emit(argument) for argument in plan.arguments)
+            return self._assign(f"{self._bind(plan.target)}({arguments})")
+        if plan.registry is _FACTORY and (plan.target.is_singleton or plan.target.is_weak):
+            create = functools.partial(
+                self._container._create_instance_from_factory, interface, plan.target, None
+            )
+            return self._assign(f"{self._bind(create)}()")
+        if plan.registry is _FACTORY:
+            factory = self._bind(plan.target.factory)
+            return self._assign(f"{factory}({self._bind(self._container)})")
+        if plan.registry is _LAZY:
+            create = functools.partial(self._container._build, interface, plan.target, None)
+            return self._assign(f"_LazyProxy({self._bind(create)})")
+        return "None"
+
+    def _bind(self, value):
+        name = f"_v{len(self._namespace)}"
+        self._namespace[name] = value
+        return name
+
+    def _assign(self, expression):
+        name = f"_l{len(self._lines)}"
+        self._lines.append(f"{name} = {expression}")
+        return name
+
+
+class _LazyProxy:
+    # Forwards attribute access, and the most common protocols, to an object
+    # that is created the first time it is needed.
+
+    __slots__ = ("_create", "_instance", "_lock")
+
+    def __init__(self, create):
+        object.__setattr__(self, "_create", create)
+        object.__setattr__(self, "_instance", _MISSING)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _get_instance(self):
+        instance = object.__getattribute__(self, "_instance")
+        if instance is _MISSING:
+            with object.__getattribute__(self, "_lock"):
+                instance = object.__getattribute__(self, "_instance")
+                if instance is _MISSING:
+                    instance = object.__getattribute__(self, "_create")()
+                    object.__setattr__(self, "_instance", instance)
+                    object.__setattr__(self, "_create", None)
+        return instance
+
+    @property
+    def __class__(self):
+        # Type checks like isinstance() see the class of the proxied object,
+        # which is constructed if needed.
+        return type(self._get_instance())
+
+    def __getattr__(self, name):
+        return getattr(self._get_instance(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._get_instance(), name, value)
+
+    def __delattr__(self, name):
+        delattr(self._get_instance(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._get_instance()(*args, **kwargs)
+
+    def __repr__(self):
+        return repr(self._get_instance())
+
+    def __str__(self):
+        return str(self._get_instance())
+
+    def __bool__(self):
+        return bool(self._get_instance())
+
+    def __len__(self):
+        return len(self._get_instance())
+
+    def __iter__(self):
+        return iter(self._get_instance())
+
+    def __contains__(self, item):
+        return item in self._get_instance()
+
+    def __getitem__(self, key):
+        return self._get_instance()[key]
+
+    def __setitem__(self, key, value):
+        self._get_instance()[key] = value
+
+    def __eq__(self, other):
+        return self._get_instance() == other
+
+    def __hash__(self):
+        return hash(self._get_instance())
+
+    def __enter__(self):
+        return self._get_instance().__enter__()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._get_instance().__exit__(exc_type, exc_value, traceback)
+
+
+class Scope:
+    """
+    Resolves objects through a :class:`Container` building every registered
+    type or transient factory at most once for the lifetime of the scope.
+    Instances and singletons are still owned by the container. Scopes are
+    not thread safe and are intended to be used by a single request or unit
+    of work. Scopes are created with :meth:`Container.scope`.
+    """
+
+    def __init__(self, container):
+        self._container = container
+        self._instances = {}
+        self._pending = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def can_resolve(self, interface, key=None):
+        """
+        Returns whether the specified ``interface`` can be resolved by the
+        container of the scope.
+        """
+        return self._container.can_resolve(interface, key)
+
+    def resolve(self, interface, key=None):
+        """
+        Resolves the specified ``interface``, or its implementation registered
+        with ``key``, reusing any object already built within the scope.
+        """
+        if key is not None:
+            return self._container._resolve_keyed(KeyedBinding(interface, key), self)
+        return self._container._resolve(interface, self)
+
+    async def resolve_async(self, interface):
+        """
+        Resolves the specified ``interface`` like :meth:`Container.resolve_async`
+        reusing any object already built within the scope.
+        """
+        return await self._container._resolve_async(interface, self)
 
-    def _collect_type_arguments(self, type_class, collect_func):
-        type_arguments = inspect.getfullargspec(type_class.__init__).args
-        return [collect_func(argument) for argument in type_arguments[1:]]
+    def close(self):
+        """
+        Drops all the objects built within the scope.
+        """
+        self._instances.clear()
@@ -0,0 +1,31 @@
+"""
+This module provides support to reference objects by dotted path strings, like
+``"accounting.services:QuickBooksOnlineAccountingService"``, so they can be
+registered without importing their modules until they are used. The module
+is specified before the colon, and the attribute path inside the module after
+it, which can be dotted to reference nested objects like ``"pkg.module:Outer.Inner"``.
+"""
+import importlib
+
+
+def import_object(path):
+    """
+    Imports the module of the specified dotted ``path`` and returns the object
+    it references.
+
+    :param str path:
+        Dotted path of the object, in the form ``"package.module:Name"``.
+
+    :return:
+        The object referenced by the path.
+
+    :raises ValueError:
+        An exception is raised if the path is not in the expected form.
+    """
+    module_name, separator, attribute_path = path.partition(":")
+    if not separator or not module_name or not attribute_path:
+        raise ValueError(f"Invalid path {path!r}, expected 'package.module:Name'")
+    imported = importlib.import_module(module_name)
+    for attribute in attribute_path.split("."):
+        imported = getattr(imported, attribute)
+    return imported
@@ -125,6 +125,17 @@ created or if it already exist, but as far as the client code is concerned, it
 shouldn't matter.
 """
 
+import collections
+import copy
+import functools
+import itertools
+import threading
+import weakref
+
+from pythern.importing import import_object
+
+_MISSING = object()
+
 
 class ObjectBuilderFactory:
     """
@@ -135,6 +146,7 @@ class ObjectBuilderFactory:
 
     def __init__(self):
         self._registered_types = {}
+        self._build_functions = {}
 
     def create(self, type_id, *args, **kwargs):
         """
@@ -155,11 +167,40 @@ class ObjectBuilderFactory:
         :raises ObjectTypeNotRegisteredError:
             An exception is raised when the specified type is not registered.
         """
-        builder = self._registered_types.get(type_id)
-        if not builder:
+        build = self._build_functions.get(type_id)
+        if build is None:
             raise ObjectTypeNotRegisteredError(type_id)
-        _function = builder if callable(builder) else builder.build
-        return _function(*args, **kwargs)
+        return build(*args, **kwargs)
+
+    def create_many(self, type_id, arguments, **kwargs):
+        """
+        Creates a new object instance for the specified ``type_id`` for each
+        item in ``arguments``. This is equivalent to calling :meth:`create`
+        for each item, but the builder is looked up only once.
+
+        :param str type_id:
+            String identifier of the type to be created. This identifier should
+            match a string used in :meth:`register_type` during registration.
+        :param iterable arguments:
+            Iterable of tuples with the positional arguments to be forwarded to
+            the registered builder for each object.
+        :param dict kwargs:
+            Keyword arguments to be forwarded to the registered builder for
+            every object.
+
+        :return:
+            A list with the objects created by the registered builder in the
+            same order as ``arguments``.
+
+        :raises ObjectTypeNotRegisteredError:
+            An exception is raised when the specified type is not registered.
+        """
+        build = self._build_functions.get(type_id)
+        if build is None:
+            raise ObjectTypeNotRegisteredError(type_id)
+        if kwargs:
+            build = functools.partial(build, **kwargs)
+        return list(itertools.starmap(build, arguments))
 
     def is_registered(self, type_id):
         """
@@ -173,7 +214,7 @@ class ObjectBuilderFactory:
         """
         return type_id in self._registered_types
 
-    def register_type(self, type_id, builder):
+    def register_type(self, type_id, builder, cache=None):
         """
         Registers a new builder under the specified object type, so the factory
         can create new instance of a class. This method does not check if the
@@ -186,6 +227,10 @@ class ObjectBuilderFactory:
         :param object builder:
             Builder object that knows how to construct the desired object for
             the specified type.
+        :param cache:
+            Optional :class:`LRUCache` or :class:`WeakValueCache` used to return
+            the same object when :meth:`create` is called again with the same
+            arguments. Caching is only suitable for immutable objects.
 
         The builder can either be an object that implements a ``build(*args, **kwargs)``
         method, or a callable object with the same signature. The following are
@@ -221,8 +266,61 @@ class ObjectBuilderFactory:
             factory.register_type('callable_class', CallableClassBuilder())
             factory.register_type('as_func', as_function_builder)
             factory.register_type('the_type', SpecificObject)
+
+        The builder can also be specified as a dotted path string, like
+        ``"accounting.builders:quick_books_builder"``, referencing any of the
+        builders above. The module is imported the first time the type is
+        created, which avoids importing modules that might never be used.
+
+        The function that builds the objects is determined during registration,
+        so :meth:`create` doesn't need to inspect the builder on every call.
+
+        Objects that are created often with the same arguments can be shared
+        by specifying a cache. Objects are cached by type and arguments, so
+        the arguments must be hashable; objects created with unhashable
+        arguments are not cached. Arguments that compare equal, like ``1``,
+        ``1.0`` and ``True``, share the same cached object:
+
+        ..  code-block:: python
+
+            colors = core_factory.LRUCache(max_size=256)
+            factory.register_type('color', Color, cache=colors)
+            factory.create('color', 255, 0, 0) is factory.create('color', 255, 0, 0)
         """
+        build = _get_build_function(builder)
+        if cache is not None:
+            build = _CachingBuilder(type_id, build, cache)
         self._registered_types[type_id] = builder
+        self._build_functions[type_id] = build
+
+    def register_prototype(self, type_id, builder, deep=False):
+        """
+        Registers a builder under the specified object type like
+        :meth:`register_type`, but the builder is only used once, without
+        arguments, to build a prototype object. Objects are then created by
+        copying the prototype, which is useful when the builder does expensive
+        setup that is the same for every object.
+
+        :param str type_id:
+            String identifier for the new type.
+        :param object builder:
+            Builder object, or dotted path to it, that knows how to construct
+            the prototype. See :meth:`register_type` for the supported builders.
+        :param bool deep:
+            Whether the prototype is copied with :func:`copy.deepcopy` instead
+            of :func:`copy.copy`.
+
+        Keyword arguments passed to :meth:`create` are set as attributes of the
+        new copy, which allows customizing each object:
+
+        ..  code-block:: python
+
+            factory.register_prototype('report', ReportTemplateBuilder())
+            report = factory.create('report', title='Sales')
+        """
+        build = _get_build_function(builder)
+        self._registered_types[type_id] = builder
+        self._build_functions[type_id] = _PrototypeBuilder(build, deep)
 
     def unregister_type(self, type_id):
         """
@@ -232,9 +330,153 @@ class ObjectBuilderFactory:
         :param str type_id:
             String identifier of the type to unregister.
         """
+        self._build_functions.pop(type_id, None)
         return self._registered_types.pop(type_id)
 
 
+def _get_build_function(builder):
+    if isinstance(builder, str):
+        return _ImportedBuilder(builder)
+    return builder if callable(builder) else builder.build
+
+
+class _ImportedBuilder:
+    def __init__(self, path):
+        self._path = path
+        self._build = None
+
+    def __call__(self, *args, **kwargs):
+        build = self._build
+        if build is None:
+            build = self._build = _get_build_function(import_object(self._path))
+        return build(*args, **kwargs)
+
+
+class _PrototypeBuilder:
+    def __init__(self, build, deep):
+        self._build = build
+        self._copy = copy.deepcopy if deep else copy.copy
+        self._prototype = _MISSING
+        self._lock = threading.Lock()
+
+    def __call__(self, **overrides):
+        prototype = self._prototype
+        if prototype is _MISSING:
+            prototype = self._build_prototype()
+        instance = self._copy(prototype)
+        for name, value in overrides.items():
+            setattr(instance, name, value)
+        return instance
+
+    def _build_prototype(self):
+        with self._lock:
+            if self._prototype is _MISSING:
+                self._prototype = self._build()
+            return self._prototype
+
+
+class _CachingBuilder:
+    def __init__(self, type_id, build, cache):
+        self._type_id = type_id
+        self._build = build
+        self._cache = cache
+
+    def __call__(self, *args, **kwargs):
+        if kwargs:
+            # Keyword arguments are sorted by name instead of collected in a
+            # frozenset, so the key is only hashed, and unhashable values are
+            # only detected, by the cache.
+            key = (self._type_id, args, tuple(sorted(kwargs.items())))
+        else:
+            key = (self._type_id, args)
+        return self._cache.get_or_build(key, self._build, args, kwargs)
+
+
+class _BuildCache:
+    # Base class of the caches, which keep the hit and miss counters. Objects
+    # are built outside of the lock, and if two threads build the same object
+    # at the same time, the first one stored is returned to both.
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build, args, kwargs):
+        try:
+            with self._lock:
+                instance = self._get(key)
+                if instance is not _MISSING:
+                    self.hits += 1
+                    return instance
+                self.misses += 1
+        except TypeError:
+            # The arguments are not hashable, so the object can't be cached.
+            with self._lock:
+                self.misses += 1
+            return build(*args, **kwargs)
+        instance = build(*args, **kwargs)
+        with self._lock:
+            return self._store(key, instance)
+
+    def clear(self):
+        """
+        Removes all the cached objects.
+        """
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class LRUCache(_BuildCache):
+    """
+    Cache policy for :meth:`ObjectBuilderFactory.register_type` that keeps up
+    to ``max_size`` objects, evicting the least recently used first. The
+    ``hits`` and ``misses`` attributes count how many objects were returned
+    from the cache or had to be built.
+    """
+
+    def __init__(self, max_size=128):
+        super().__init__()
+        self.max_size = max_size
+        self._data = collections.OrderedDict()
+
+    def _get(self, key):
+        instance = self._data.get(key, _MISSING)
+        if instance is not _MISSING:
+            self._data.move_to_end(key)
+        return instance
+
+    def _store(self, key, instance):
+        instance = self._data.setdefault(key, instance)
+        self._data.move_to_end(key)
+        if len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+        return instance
+
+
+class WeakValueCache(_BuildCache):
+    """
+    Cache policy for :meth:`ObjectBuilderFactory.register_type` that keeps
+    weak references to the objects, so objects are shared while they are in
+    use and are released when nothing else references them. The objects must
+    support weak references. The ``hits`` and ``misses`` attributes count how
+    many objects were returned from the cache or had to be built.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._data = weakref.WeakValueDictionary()
+
+    def _get(self, key):
+        return self._data.get(key, _MISSING)
+
+    def _store(self, key, instance):
+        return self._data.setdefault(key, instance)
+
+
 class ObjectTypeNotRegisteredError(ValueError):
     """
     Exception class used to report errors when creating an object types through a
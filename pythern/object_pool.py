@@ -0,0 +1,245 @@
+"""
+This module provides an implementation of the
+`Object Pool <https://en.wikipedia.org/wiki/Object_pool_pattern>`_ pattern,
+which reuses objects that are expensive to create instead of creating a new
+one every time one is needed. Parsers, database cursors or compression
+contexts are good candidates, as long as they can be reset between uses.
+
+The following is an example on how to use the :class:`ObjectPool` class:
+
+..  code-block:: python
+
+    import pythern.object_pool as object_pool
+
+    pool = object_pool.ObjectPool(TemplateParser, min_size=2, max_size=8, idle_timeout=60)
+
+    with pool.lease() as parser:
+        parser.parse(template)
+
+The pool creates objects on demand until ``max_size`` objects exist, and after
+that callers wait until another caller returns its object. Objects that have
+been idle for longer than ``idle_timeout`` seconds are evicted, but the pool
+always keeps at least ``min_size`` objects. Eviction doesn't use a background
+thread; it happens when objects are acquired or released, so a pool that goes
+quiet keeps its idle objects until :meth:`ObjectPool.evict_idle` is invoked,
+for example from a periodic maintenance task.
+"""
+import collections
+import contextlib
+import threading
+import time
+
+
+_MISSING = object()
+
+PoolStats = collections.namedtuple(
+    "PoolStats", ["hits", "misses", "evictions", "size", "idle", "in_use"]
+)
+
+
+class ObjectPool:
+    """
+    Thread safe pool of reusable objects created by the specified ``create``
+    callable.
+
+    :param callable create:
+        Callable invoked without arguments to create a new object.
+    :param int min_size:
+        Minimum number of objects kept by the pool when evicting idle objects.
+    :param int max_size:
+        Maximum number of objects created by the pool, or ``None`` if there
+        is no limit.
+    :param float idle_timeout:
+        Number of seconds after which an idle object is evicted, or ``None``
+        if idle objects are never evicted.
+    :param callable dispose:
+        Optional callable invoked with every object evicted from the pool.
+    """
+
+    def __init__(
+        self, create, min_size=0, max_size=None, idle_timeout=None, dispose=None
+    ):
+        if max_size is not None and max_size < max(min_size, 1):
+            raise ValueError("max_size must be at least 1 and not less than min_size")
+        self._create = create
+        self._min_size = min_size
+        self._max_size = max_size
+        self._idle_timeout = idle_timeout
+        self._dispose = dispose
+        self._condition = threading.Condition()
+        self._idle = collections.deque()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._closed = False
+
+    def acquire(self, timeout=None):
+        """
+        Returns an idle object from the pool, or a new one if there are no idle
+        objects and the pool has not reached its maximum size. Objects acquired
+        must be returned to the pool with :meth:`release`.
+
+        :param float timeout:
+            Number of seconds to wait for an object to be released when the
+            pool is exhausted, or ``None`` to wait indefinitely.
+
+        :raises PoolExhaustedError:
+            An exception is raised if no object becomes available before the
+            specified ``timeout``.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            evicted = self._evict_idle()
+            while not self._idle and self._is_full():
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise PoolExhaustedError(self._max_size)
+                self._condition.wait(remaining)
+            if self._idle:
+                # The most recently released object is reused first, so the
+                # objects that are not needed become idle and get evicted.
+                instance, _ = self._idle.pop()
+                self._hits += 1
+            else:
+                instance = _MISSING
+                self._size += 1
+                self._misses += 1
+        self._dispose_all(evicted)
+        if instance is not _MISSING:
+            return instance
+        try:
+            return self._create()
+        except BaseException:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, instance):
+        """
+        Returns an object previously obtained from :meth:`acquire` to the pool.
+        """
+        with self._condition:
+            if self._closed:
+                self._size -= 1
+                evicted = [instance]
+            else:
+                self._idle.append((instance, time.monotonic()))
+                evicted = self._evict_idle()
+            self._condition.notify()
+        self._dispose_all(evicted)
+
+    @contextlib.contextmanager
+    def lease(self, timeout=None):
+        """
+        Context manager that acquires an object from the pool and releases it
+        when the context exits. See :meth:`acquire` for a description of the
+        ``timeout`` parameter.
+        """
+        instance = self.acquire(timeout)
+        try:
+            yield instance
+        finally:
+            self.release(instance)
+
+    def fill(self):
+        """
+        Creates objects until the pool holds ``min_size`` of them.
+        """
+        while True:
+            with self._condition:
+                if self._size >= self._min_size:
+                    return
+                self._size += 1
+            try:
+                instance = self._create()
+            except BaseException:
+                with self._condition:
+                    self._size -= 1
+                raise
+            self.release(instance)
+
+    def evict_idle(self):
+        """
+        Evicts, and disposes, the objects that have been idle for longer than
+        ``idle_timeout`` seconds, keeping at least ``min_size`` objects.
+
+        :return:
+            The number of objects evicted.
+        """
+        with self._condition:
+            evicted = self._evict_idle()
+        self._dispose_all(evicted)
+        return len(evicted)
+
+    def drain(self):
+        """
+        Removes all the idle objects from the pool, regardless of
+        ``min_size``, and disposes them with the ``dispose`` callback. Objects
+        in use are returned to the pool as usual when they are released.
+        """
+        with self._condition:
+            drained = [instance for instance, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(drained)
+            self._condition.notify_all()
+        self._dispose_all(drained)
+
+    def close(self):
+        """
+        Drains the pool, and disposes the objects in use when they are
+        released instead of returning them to the pool.
+        """
+        with self._condition:
+            self._closed = True
+        self.drain()
+
+    def stats(self):
+        """
+        Returns a :class:`PoolStats` snapshot with the number of acquisitions
+        served by idle objects (``hits``) or by new objects (``misses``), the
+        number of evicted objects, and the current number of objects.
+        """
+        with self._condition:
+            idle = len(self._idle)
+            return PoolStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=self._size,
+                idle=idle,
+                in_use=self._size - idle,
+            )
+
+    def _is_full(self):
+        return self._max_size is not None and self._size >= self._max_size
+
+    def _evict_idle(self):
+        evicted = []
+        if self._idle_timeout is None:
+            return evicted
+        expiration = time.monotonic() - self._idle_timeout
+        while self._idle and self._size > self._min_size and self._idle[0][1] < expiration:
+            instance, _ = self._idle.popleft()
+            evicted.append(instance)
+            self._size -= 1
+            self._evictions += 1
+        return evicted
+
+    def _dispose_all(self, instances):
+        # Evicted objects are disposed outside of the lock, so slow disposals
+        # don't block other callers.
+        if self._dispose is not None:
+            for instance in instances:
+                self._dispose(instance)
+
+
+class PoolExhaustedError(RuntimeError):
+    """
+    Exception class used to report that no object became available in a pool
+    that reached its maximum size before the specified timeout.
+    """
+
+    def __init__(self, max_size):
+        super().__init__(max_size)
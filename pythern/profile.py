@@ -0,0 +1,161 @@
+"""
+Command line tool that profiles the composition root of an application. It
+builds the :class:`pythern.container.Container` returned by the specified
+function, resolves every registered interface and keyed binding, and prints
+the tree of objects constructed with the time, the memory allocated and the
+number of objects created by each node, including its dependencies:
+
+..  code-block:: bash
+
+    python -m pythern.profile accounting.composition:build_container
+    python -m pythern.profile accounting.composition:build_container --json --output profile.json
+
+The JSON output contains the same tree and can be used to compare runs in CI.
+Memory is measured with :mod:`tracemalloc`, which slows down the construction,
+so times are only comparable between runs of this tool.
+"""
+import argparse
+import json
+import sys
+import tracemalloc
+
+from pythern.container import KeyedBinding
+from pythern.importing import import_object
+
+
+def profile_container(container):
+    """
+    Resolves every interface and keyed binding registered in ``container``
+    and returns a list with the tree of objects constructed for each of them. Each node of
+    the tree is a dictionary with the ``interface``, the ``time`` in seconds,
+    the ``memory`` allocated in bytes, the number of ``instances`` created and
+    the ``children`` nodes. Singletons are only constructed, and reported,
+    the first time they are resolved.
+    """
+    profiler = _ConstructionProfiler()
+    was_instrumented = container.is_instrumented()
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    container.add_construction_hooks(profiler.pre_construction, profiler.post_construction)
+    container.enable_instrumentation()
+    try:
+        for interface in container.registered_interfaces():
+            profiler.profile(interface, lambda: container.resolve(interface))
+        for binding in container.keyed_bindings():
+            profiler.profile(binding, lambda: container.resolve(*binding))
+    finally:
+        if not was_instrumented:
+            container.disable_instrumentation()
+        container.remove_construction_hooks(
+            profiler.pre_construction, profiler.post_construction
+        )
+        if started_tracing:
+            tracemalloc.stop()
+    return profiler.roots
+
+
+def format_tree(roots):
+    """
+    Returns a human readable representation of the tree returned by
+    :func:`profile_container`.
+    """
+    lines = []
+    for root in roots:
+        _format_node(root, "", lines)
+    return "\n".join(lines)
+
+
+class _ConstructionProfiler:
+    def __init__(self):
+        self.roots = []
+        self._stack = []
+
+    def profile(self, interface, resolve):
+        try:
+            resolve()
+        except Exception as error:
+            # The nodes of the failed construction never received their
+            # post-construction notification.
+            del self._stack[:]
+            self.roots.append(_create_node(interface, error=repr(error)))
+
+    def pre_construction(self, interface):
+        node = _create_node(interface)
+        node["memory"] = tracemalloc.get_traced_memory()[0]
+        self._stack.append(node)
+
+    def post_construction(self, interface, instance, elapsed):
+        node = self._stack.pop()
+        node["time"] = elapsed
+        node["memory"] = max(tracemalloc.get_traced_memory()[0] - node["memory"], 0)
+        node["instances"] = 1 + sum(child["instances"] for child in node["children"])
+        if self._stack:
+            self._stack[-1]["children"].append(node)
+        else:
+            self.roots.append(node)
+
+
+def _create_node(interface, error=None):
+    node = {
+        "interface": _describe(interface),
+        "time": 0.0,
+        "memory": 0,
+        "instances": 0,
+        "children": [],
+    }
+    if error is not None:
+        node["error"] = error
+    return node
+
+
+def _describe(interface):
+    if isinstance(interface, KeyedBinding):
+        return f"{_describe(interface.interface)}[{interface.key!r}]"
+    if isinstance(interface, str):
+        return interface
+    if isinstance(interface, type):
+        return f"{interface.__module__}.{interface.__qualname__}"
+    return repr(interface)
+
+
+def _format_node(node, indent, lines):
+    if "error" in node:
+        lines.append(f"{indent}{node['interface']}  ERROR {node['error']}")
+        return
+    lines.append(
+        f"{indent}{node['interface']}  {node['time'] * 1000:.3f} ms  "
+        f"{node['memory'] / 1024:.1f} KiB  {node['instances']} instances"
+    )
+    for child in node["children"]:
+        _format_node(child, indent + "    ", lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m pythern.profile",
+        description="Profiles the construction of the objects registered in a container",
+    )
+    parser.add_argument(
+        "builder",
+        help="Dotted path of the function that builds the container, like package.module:function",
+    )
+    parser.add_argument("--json", action="store_true", help="Prints the results as JSON")
+    parser.add_argument("--output", help="File where the results are written")
+    options = parser.parse_args(argv)
+    container = import_object(options.builder)()
+    roots = profile_container(container)
+    if options.json:
+        output = json.dumps({"builder": options.builder, "roots": roots}, indent=2)
+    else:
+        output = format_tree(roots)
+    if options.output:
+        with open(options.output, "w") as output_file:
+            output_file.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
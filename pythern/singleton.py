@@ -59,8 +59,62 @@ the example above, it is recommended to make the class internal.
 Alternatively, you can implement the full interface in the public class, in our
 example ``RatingService``, but doing so it makes the class a Singleton in
 any context or application where the class is used.
+
+Applications that run pre-fork servers can specify what happens to a singleton
+in the forked worker processes with the ``fork_policy`` class keyword:
+
+..  code-block:: python
+
+    class TemplateCache(
+        metaclass=core_singleton.Singleton, fork_policy=core_singleton.SHARE
+    ):
+        pass
+
+
+    class ConnectionPool(
+        metaclass=core_singleton.Singleton, fork_policy=core_singleton.RESET
+    ):
+        pass
+
+
+    # in the parent process, before forking the workers.
+    core_singleton.instantiate_shared()
+
+Singletons with the :data:`SHARE` policy are meant to be created in the parent
+process by :func:`instantiate_shared`, so the workers share their memory
+through copy-on-write. Singletons with the :data:`RESET` policy, like those
+holding sockets or threads, are dropped in the child process after a fork and
+created again the first time they are used. Singletons without a policy are
+inherited by the child process as they are.
+
+Types that are not thread safe can be declared with the :class:`ThreadLocalSingleton`
+or :class:`ContextLocalSingleton` metaclasses instead, which create one instance
+per thread or per :mod:`contextvars` context, like each asyncio task, so the
+instance can be used without locks:
+
+..  code-block:: python
+
+    class HttpClient(metaclass=core_singleton.ThreadLocalSingleton):
+        pass
+
+
+    HttpClient() is HttpClient()    # True in the same thread.
+    HttpClient.all_instances()      # The instances of all the running threads.
+    HttpClient.dispose_instances(lambda client: client.close())
 """
 
+import contextvars
+import os
+import threading
+import weakref
+
+_MISSING = object()
+
+#: Fork policy of singletons created in the parent and shared with the workers.
+SHARE = "share"
+#: Fork policy of singletons that are created again in each worker.
+RESET = "reset"
+
 
 class Singleton(type):
     """
@@ -69,8 +123,179 @@ class Singleton(type):
     """
 
     _instances = {}
+    _fork_policies = {}
+
+    def __new__(mcs, name, bases, namespace, fork_policy=None, **kwargs):
+        return super().__new__(mcs, name, bases, namespace, **kwargs)
+
+    def __init__(cls, name, bases, namespace, fork_policy=None, **kwargs):
+        super().__init__(name, bases, namespace, **kwargs)
+        if fork_policy is None:
+            # Derived singletons inherit the policy of their base classes.
+            fork_policy = next(
+                (
+                    Singleton._fork_policies[base]
+                    for base in cls.__mro__[1:]
+                    if base in Singleton._fork_policies
+                ),
+                None,
+            )
+        if fork_policy not in (None, SHARE, RESET):
+            raise ValueError(f"Invalid fork policy {fork_policy!r}")
+        if fork_policy is not None:
+            Singleton._fork_policies[cls] = fork_policy
 
     def __call__(cls, *args, **kwargs):
         if cls not in cls._instances:
             cls._instances[cls] = super(Singleton, cls).__call__(*args, **kwargs)
         return cls._instances[cls]
+
+
+class ThreadLocalSingleton(type):
+    """
+    Metaclass that insures only one instance of a type is created per thread.
+    """
+
+    _locals = {}
+    _registries = {}
+    _lock = threading.Lock()
+
+    def __call__(cls, *args, **kwargs):
+        local = ThreadLocalSingleton._locals.get(cls)
+        if local is None:
+            local = ThreadLocalSingleton._locals.setdefault(cls, threading.local())
+        instance = getattr(local, "instance", _MISSING)
+        if instance is _MISSING:
+            instance = super(ThreadLocalSingleton, cls).__call__(*args, **kwargs)
+            local.instance = instance
+            with ThreadLocalSingleton._lock:
+                registry = ThreadLocalSingleton._registries.setdefault(cls, {})
+                _remove_finished_threads(registry)
+                thread = threading.current_thread()
+                registry[id(thread)] = (weakref.ref(thread), instance)
+        return instance
+
+    def all_instances(cls):
+        """
+        Returns a list with the instances of the type created by the threads
+        that are still running.
+        """
+        with ThreadLocalSingleton._lock:
+            registry = ThreadLocalSingleton._registries.get(cls, {})
+            _remove_finished_threads(registry)
+            return [instance for _, instance in registry.values()]
+
+    def dispose_instances(cls, dispose=None):
+        """
+        Drops the instances of the type in all threads, so new instances are
+        created the next time they are needed.
+
+        :param callable dispose:
+            Optional callable invoked with each instance dropped.
+        """
+        with ThreadLocalSingleton._lock:
+            ThreadLocalSingleton._locals.pop(cls, None)
+            registry = ThreadLocalSingleton._registries.pop(cls, {})
+        _dispose_all([instance for _, instance in registry.values()], dispose)
+
+
+class ContextLocalSingleton(type):
+    """
+    Metaclass that insures only one instance of a type is created per
+    :mod:`contextvars` context. Asyncio tasks run in a copy of the context
+    in which they were created, so each task gets its own instance unless it
+    was already created in the context that started the task.
+
+    Only instances that support weak references are returned by
+    :meth:`all_instances` and disposed by :meth:`dispose_instances`, so the
+    instances of finished contexts can be released.
+    """
+
+    _variables = {}
+    _registries = {}
+    _lock = threading.Lock()
+
+    def __call__(cls, *args, **kwargs):
+        variable = ContextLocalSingleton._variables.get(cls)
+        if variable is None:
+            with ContextLocalSingleton._lock:
+                variable = ContextLocalSingleton._variables.get(cls)
+                if variable is None:
+                    variable = contextvars.ContextVar(f"{cls.__qualname__}_instance")
+                    ContextLocalSingleton._variables[cls] = variable
+        instance = variable.get(_MISSING)
+        if instance is _MISSING:
+            instance = super(ContextLocalSingleton, cls).__call__(*args, **kwargs)
+            variable.set(instance)
+            with ContextLocalSingleton._lock:
+                registry = ContextLocalSingleton._registries.setdefault(
+                    cls, weakref.WeakSet()
+                )
+                try:
+                    registry.add(instance)
+                except TypeError:
+                    pass
+        return instance
+
+    def all_instances(cls):
+        """
+        Returns a list with the instances of the type that are still alive.
+        """
+        with ContextLocalSingleton._lock:
+            return list(ContextLocalSingleton._registries.get(cls, ()))
+
+    def dispose_instances(cls, dispose=None):
+        """
+        Drops the instances of the type in all contexts, so new instances are
+        created the next time they are needed.
+
+        :param callable dispose:
+            Optional callable invoked with each instance dropped.
+        """
+        with ContextLocalSingleton._lock:
+            # Contexts can't be modified from outside, so the variable is
+            # replaced and the values in the existing contexts are ignored.
+            ContextLocalSingleton._variables.pop(cls, None)
+            registry = ContextLocalSingleton._registries.pop(cls, ())
+            instances = list(registry)
+        _dispose_all(instances, dispose)
+
+
+def _remove_finished_threads(registry):
+    for key, (thread_reference, _) in list(registry.items()):
+        thread = thread_reference()
+        if thread is None or not thread.is_alive():
+            del registry[key]
+
+
+def _dispose_all(instances, dispose):
+    if dispose is not None:
+        for instance in instances:
+            dispose(instance)
+
+
+def instantiate_shared():
+    """
+    Creates the instances of all the singletons declared with the
+    :data:`SHARE` fork policy that have not been created yet. This function
+    should be called in the parent process before forking the workers, and
+    the singleton classes must be constructible without arguments.
+
+    :return:
+        A list with the instances of the shared singletons.
+    """
+    return [
+        singleton_class()
+        for singleton_class, fork_policy in list(Singleton._fork_policies.items())
+        if fork_policy == SHARE
+    ]
+
+
+def _reset_after_fork():
+    for singleton_class, fork_policy in list(Singleton._fork_policies.items()):
+        if fork_policy == RESET:
+            Singleton._instances.pop(singleton_class, None)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
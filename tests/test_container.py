@@ -1,8 +1,15 @@
+import asyncio
+import gc
+import threading
+import time
 import unittest
+from unittest import mock
 
 from assertpy import assert_that
+import pytest
 
 import pythern.container as container
+import pythern.object_factory as core_factory
 
 
 class TestContainer(unittest.TestCase):
@@ -81,6 +88,931 @@ class TestContainer(unittest.TestCase):
         assert_that(instance_1).is_same_as(instance_2)
         self.assertIs(instance_1, instance_2)
 
+    def test_singleton_factory_is_invoked_once_from_concurrent_threads(self):
+        factory = SlowFactory()
+        self.container.register_factory(self.factory_interface, factory, is_singleton=True)
+        thread_count = 16
+        barrier = threading.Barrier(thread_count)
+        resolved = []
+
+        def resolve():
+            barrier.wait()
+            resolved.append(self.container.resolve(self.factory_interface))
+
+        threads = [threading.Thread(target=resolve) for _ in range(thread_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert_that(factory.invocations).is_equal_to(1)
+        assert_that(set(map(id, resolved))).is_length(1)
+
+    def test_scope_builds_registered_types_once_across_injection_sites(self):
+        self.container.register_type("pair", ManagerPair)
+        with self.container.scope() as scope:
+            pair = scope.resolve("pair")
+            composite = scope.resolve(self.composite_interface)
+        assert_that(pair.composite.manager).is_same_as(pair.manager)
+        assert_that(composite).is_same_as(pair.composite)
+
+    def test_different_scopes_build_their_own_instances(self):
+        with self.container.scope() as scope:
+            first = scope.resolve(self.type_interface)
+        with self.container.scope() as scope:
+            second = scope.resolve(self.type_interface)
+        assert_that(first).is_not_same_as(second)
+
+    def test_resolving_without_scope_builds_new_instances(self):
+        self.container.register_type("pair", ManagerPair)
+        pair = self.container.resolve("pair")
+        assert_that(pair.composite.manager).is_not_same_as(pair.manager)
+
+    def test_transient_factories_receive_the_scope(self):
+        with self.container.scope() as scope:
+            first = scope.resolve(self.factory_interface)
+            second = scope.resolve(self.factory_interface)
+        assert_that(self.factory.invoked_container).is_same_as(scope)
+        assert_that(first).is_same_as(second)
+
+    def test_scope_drops_instances_on_exit(self):
+        with self.container.scope() as scope:
+            first = scope.resolve(self.type_interface)
+        second = scope.resolve(self.type_interface)
+        assert_that(first).is_not_same_as(second)
+
+    def test_resolve_async_awaits_asynchronous_factories(self):
+        self.container.register_factory("async_service", AsyncFactory(Service))
+        instance = asyncio.run(self.container.resolve_async("async_service"))
+        assert_that(instance).is_instance_of(Service)
+
+    def test_resolve_async_resolves_types_and_synchronous_factories(self):
+        instance = asyncio.run(self.container.resolve_async(self.composite_interface))
+        assert_that(instance.service).is_same_as(self.service)
+        assert_that(instance.manager).is_instance_of(Manager)
+        instance = asyncio.run(self.container.resolve_async(self.factory_interface))
+        assert_that(instance).is_instance_of(Manager)
+
+    def test_resolve_async_builds_sibling_dependencies_concurrently(self):
+        tracker = ConcurrencyTracker()
+        di_container = container.Container()
+        di_container.register_factory("service", AsyncFactory(Service, tracker))
+        di_container.register_factory("manager", AsyncFactory(Manager, tracker))
+        instance = asyncio.run(di_container.resolve_async(CompositeObject))
+        assert_that(instance.service).is_instance_of(Service)
+        assert_that(tracker.max_concurrent).is_equal_to(2)
+
+    def test_async_singletons_are_awaited_once_for_concurrent_resolutions(self):
+        factory = AsyncFactory(Service)
+        self.container.register_factory("async_service", factory, is_singleton=True)
+
+        async def resolve_concurrently():
+            return await asyncio.gather(
+                *[self.container.resolve_async("async_service") for _ in range(10)]
+            )
+
+        instances = asyncio.run(resolve_concurrently())
+        assert_that(factory.invocations).is_equal_to(1)
+        assert_that(set(map(id, instances))).is_length(1)
+        assert_that(self.container.resolve("async_service")).is_same_as(instances[0])
+
+    def test_synchronous_resolution_of_asynchronous_singletons_fails(self):
+        factory = AsyncFactory(Service)
+        self.container.register_factory("async_service", factory, is_singleton=True)
+        with pytest.raises(TypeError, match="resolve_async"):
+            self.container.resolve("async_service")
+        instance = asyncio.run(self.container.resolve_async("async_service"))
+        assert_that(instance).is_instance_of(Service)
+        assert_that(self.container.resolve("async_service")).is_same_as(instance)
+
+    def test_scope_shares_asynchronously_resolved_instances(self):
+        factory = AsyncFactory(Manager)
+        di_container = container.Container()
+        di_container.register_instance("service", self.service)
+        di_container.register_factory("manager", factory)
+        di_container.register_type("composite", CompositeObject)
+        di_container.register_type("pair", ManagerPair)
+
+        async def resolve_in_scope():
+            with di_container.scope() as scope:
+                return await scope.resolve_async("pair")
+
+        pair = asyncio.run(resolve_in_scope())
+        assert_that(pair.composite.manager).is_same_as(pair.manager)
+        assert_that(factory.invocations).is_equal_to(1)
+
+    def test_warm_up_builds_singleton_factories(self):
+        self.container.register_factory(self.factory_interface, self.factory, is_singleton=True)
+        self.container.warm_up()
+        assert_that(self.factory.invoked_container).is_same_as(self.container)
+        self.factory.invoked_container = None
+        self.container.resolve(self.factory_interface)
+        assert_that(self.factory.invoked_container).is_none()
+
+    def test_warm_up_reports_time_for_each_registration(self):
+        self.container.register_factory(self.factory_interface, self.factory, is_singleton=True)
+        timings = self.container.warm_up()
+        assert_that(timings).contains_only(
+            self.type_interface, self.composite_interface, self.factory_interface
+        )
+
+    def test_warm_up_builds_independent_singletons_in_parallel(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def factory(container):
+            barrier.wait()
+            return Service()
+
+        self.container.register_factory("first", factory, is_singleton=True)
+        self.container.register_factory("second", factory, is_singleton=True)
+        self.container.warm_up(max_workers=2)
+        assert_that(barrier.broken).is_false()
+
+    def test_warm_up_async_awaits_asynchronous_singletons(self):
+        factory = AsyncFactory(Service)
+        self.container.register_factory("async_service", factory, is_singleton=True)
+        self.container.register_factory(self.factory_interface, self.factory, is_singleton=True)
+        self.container.register_pool("pooled", self.factory, min_size=1)
+        durations = asyncio.run(self.container.warm_up_async())
+        assert_that(durations).contains_key("async_service", self.factory_interface, "pooled")
+        assert_that(factory.invocations).is_equal_to(1)
+        assert_that(self.container.resolve("async_service")).is_instance_of(Service)
+        assert_that(self.container.pool_stats("pooled").idle).is_equal_to(1)
+
+    def test_warm_up_does_not_build_transient_registrations(self):
+        self.container.warm_up()
+        assert_that(self.factory.invoked_container).is_none()
+
+    def test_lazy_type_is_constructed_on_first_attribute_access(self):
+        self.container.register_type("lazy", CountedObject, is_lazy=True)
+        counter = CountedObject.instances
+        proxy = self.container.resolve("lazy")
+        assert_that(CountedObject.instances).is_equal_to(counter)
+        assert_that(proxy.value).is_equal_to(counter + 1)
+        assert_that(proxy.value).is_equal_to(counter + 1)
+        assert_that(CountedObject.instances).is_equal_to(counter + 1)
+
+    def test_lazy_type_dependencies_are_injected_as_proxies(self):
+        self.container.register_type(self.type_interface, CountedObject, is_lazy=True)
+        counter = CountedObject.instances
+        instance = self.container.resolve(self.composite_interface)
+        assert_that(CountedObject.instances).is_equal_to(counter)
+        assert_that(instance.manager.value).is_equal_to(counter + 1)
+
+    def test_lazy_factory_is_invoked_on_first_attribute_access(self):
+        self.container.register_factory(self.factory_interface, self.factory, is_lazy=True)
+        proxy = self.container.resolve(self.factory_interface)
+        assert_that(self.factory.invoked_container).is_none()
+        assert_that(proxy.__dict__).is_empty()
+        assert_that(self.factory.invoked_container).is_same_as(self.container)
+
+    def test_lazy_proxies_pass_type_checks_of_the_proxied_class(self):
+        self.container.register_type("lazy", CountedObject, is_lazy=True)
+        proxy = self.container.resolve("lazy")
+        assert_that(isinstance(proxy, CountedObject)).is_true()
+        assert_that(proxy.__class__).is_same_as(CountedObject)
+        assert_that(isinstance(proxy, Manager)).is_false()
+
+    def test_lazy_singleton_proxies_share_the_same_instance(self):
+        self.container.register_factory(
+            "lazy", lambda c: CountedObject(), is_singleton=True, is_lazy=True
+        )
+        first = self.container.resolve("lazy")
+        second = self.container.resolve("lazy")
+        assert_that(first.value).is_equal_to(second.value)
+
+    def test_compiled_function_builds_the_object_graph(self):
+        create = self.container.compile(self.composite_interface)
+        first = create()
+        second = create()
+        assert_that(first).is_instance_of(self.composite_type)
+        assert_that(first.service).is_same_as(self.service)
+        assert_that(first.manager).is_instance_of(Manager)
+        assert_that(first.manager).is_not_same_as(second.manager)
+
+    def test_compiled_function_does_not_use_the_container_lookups(self):
+        create = self.container.compile(self.composite_interface)
+        with mock.patch.object(self.container, "_resolve") as resolve:
+            create()
+        resolve.assert_not_called()
+
+    def test_compiled_function_invokes_factories_with_the_container(self):
+        create = self.container.compile(self.factory_interface)
+        instance = create()
+        assert_that(instance).is_instance_of(Manager)
+        assert_that(self.factory.invoked_container).is_same_as(self.container)
+
+    def test_compiled_function_creates_singletons_once(self):
+        self.container.register_factory(self.factory_interface, SlowFactory(), is_singleton=True)
+        create = self.container.compile(self.factory_interface)
+        assert_that(create()).is_same_as(create())
+        assert_that(create()).is_same_as(self.container.resolve(self.factory_interface))
+
+    def test_compiled_function_returns_none_for_unresolvable_types(self):
+        create = self.container.compile(UnresolvableObject)
+        assert_that(create()).is_none()
+
+    def test_compiled_function_supports_deep_graphs(self):
+        depth = 300
+        for level in range(depth):
+            self.container.register_type(f"level_{level}", _make_level_type(level))
+        instance = self.container.compile(f"level_{depth - 1}")()
+        assert_that(instance.dependency.dependency).is_not_none()
+
+    def test_lists_registered_interfaces_and_keyed_bindings(self):
+        self.container.register_keyed("accounting", "standard", Manager)
+        child = self.container.child()
+        child.register_factory("child_factory", self.factory)
+        assert_that(child.registered_interfaces()).contains_only(
+            self.service_interface,
+            self.type_interface,
+            self.composite_interface,
+            self.factory_interface,
+            "child_factory",
+        )
+        assert_that(child.keyed_bindings()).is_equal_to(
+            [container.KeyedBinding("accounting", "standard")]
+        )
+
+    def test_reports_whether_instrumentation_is_enabled(self):
+        assert_that(self.container.is_instrumented()).is_false()
+        self.container.enable_instrumentation()
+        assert_that(self.container.is_instrumented()).is_true()
+        self.container.disable_instrumentation()
+        assert_that(self.container.is_instrumented()).is_false()
+
+    def test_stats_are_empty_when_instrumentation_is_disabled(self):
+        self.container.resolve(self.composite_interface)
+        assert_that(self.container.stats()).is_empty()
+
+    def test_instrumentation_counts_resolutions_and_constructions(self):
+        self.container.enable_instrumentation()
+        self.container.resolve(self.composite_interface)
+        self.container.resolve(self.composite_interface)
+        stats = self.container.stats()
+        assert_that(stats[self.composite_interface].resolutions).is_equal_to(2)
+        assert_that(stats[self.composite_interface].constructions).is_equal_to(2)
+        assert_that(stats[self.type_interface].constructions).is_equal_to(2)
+        assert_that(stats[self.service_interface].cache_hits).is_equal_to(2)
+
+    def test_instrumentation_counts_singletons_as_cache_hits(self):
+        self.container.register_factory(self.factory_interface, self.factory, is_singleton=True)
+        self.container.enable_instrumentation()
+        for _ in range(3):
+            self.container.resolve(self.factory_interface)
+        stats = self.container.stats()[self.factory_interface]
+        assert_that(stats.constructions).is_equal_to(1)
+        assert_that(stats.cache_hits).is_equal_to(2)
+
+    def test_instrumentation_counts_weak_singletons_as_cache_hits(self):
+        self.container.register_factory(self.factory_interface, self.factory, is_weak=True)
+        self.container.enable_instrumentation()
+        instance = self.container.resolve(self.factory_interface)
+        for _ in range(3):
+            self.container.resolve(self.factory_interface)
+        stats = self.container.stats()[self.factory_interface]
+        assert_that(stats.constructions).is_equal_to(1)
+        assert_that(stats.cache_hits).is_equal_to(3)
+        assert_that(instance).is_not_none()
+
+    def test_instrumentation_counts_parent_singletons_in_children_as_cache_hits(self):
+        self.container.register_factory(self.factory_interface, self.factory, is_singleton=True)
+        child = self.container.child()
+        child.enable_instrumentation()
+        for _ in range(3):
+            child.resolve(self.factory_interface)
+        stats = child.stats()[self.factory_interface]
+        assert_that(stats.constructions).is_equal_to(1)
+        assert_that(stats.cache_hits).is_equal_to(2)
+
+    def test_instrumentation_counts_lazy_objects_once(self):
+        events = []
+        self.container.register_type("lazy", Manager, is_lazy=True)
+        self.container.add_construction_hooks(
+            post_construction=lambda interface, instance, elapsed: events.append(interface)
+        )
+        self.container.enable_instrumentation()
+        proxy = self.container.resolve("lazy")
+        assert_that(events).is_empty()
+        str(proxy)
+        assert_that(self.container.stats()["lazy"].constructions).is_equal_to(1)
+        assert_that(events).is_equal_to(["lazy"])
+
+    def test_instrumentation_counts_keyed_resolutions(self):
+        self.container.register_keyed("accounting", "standard", Manager)
+        self.container.register_keyed("accounting", "shared", Manager, is_singleton=True)
+        self.container.enable_instrumentation()
+        for _ in range(2):
+            self.container.resolve("accounting", key="standard")
+            self.container.resolve("accounting", key="shared")
+        stats = self.container.stats()
+        assert_that(stats[("accounting", "standard")].resolutions).is_equal_to(2)
+        assert_that(stats[("accounting", "standard")].constructions).is_equal_to(2)
+        assert_that(stats[("accounting", "shared")].constructions).is_equal_to(1)
+        assert_that(stats[("accounting", "shared")].cache_hits).is_equal_to(1)
+
+    def test_instrumentation_records_construction_times(self):
+        self.container.register_factory(self.factory_interface, SlowFactory())
+        self.container.enable_instrumentation()
+        self.container.resolve(self.factory_interface)
+        stats = self.container.stats()[self.factory_interface]
+        assert_that(stats.total_time).is_greater_than_or_equal_to(0.01)
+        assert_that(stats.max_time).is_equal_to(stats.total_time)
+
+    def test_construction_hooks_are_invoked_around_constructions(self):
+        events = []
+        self.container.add_construction_hooks(
+            lambda interface: events.append(("pre", interface)),
+            lambda interface, instance, elapsed: events.append(("post", interface)),
+        )
+        self.container.enable_instrumentation()
+        self.container.resolve(self.composite_interface)
+        assert_that(events).is_equal_to(
+            [
+                ("pre", self.composite_interface),
+                ("pre", self.type_interface),
+                ("post", self.type_interface),
+                ("post", self.composite_interface),
+            ]
+        )
+
+    def test_disabling_instrumentation_stops_recording(self):
+        self.container.enable_instrumentation()
+        self.container.resolve(self.type_interface)
+        self.container.disable_instrumentation()
+        self.container.resolve(self.type_interface)
+        assert_that(self.container.stats()[self.type_interface].resolutions).is_equal_to(1)
+
+    def test_instrumentation_records_asynchronous_resolutions(self):
+        self.container.enable_instrumentation()
+        asyncio.run(self.container.resolve_async(self.composite_interface))
+        stats = self.container.stats()
+        assert_that(stats[self.composite_interface].constructions).is_equal_to(1)
+        assert_that(stats[self.type_interface].constructions).is_equal_to(1)
+
+    def test_resolve_many_returns_instances_in_order(self):
+        instances = self.container.resolve_many(
+            [self.type_interface, self.service_interface, self.composite_interface]
+        )
+        assert_that(instances[0]).is_instance_of(Manager)
+        assert_that(instances[1]).is_same_as(self.service)
+        assert_that(instances[2]).is_instance_of(self.composite_type)
+
+    def test_resolve_many_builds_shared_dependencies_once(self):
+        self.container.register_type("pair", ManagerPair)
+        manager, composite, pair = self.container.resolve_many(
+            [self.type_interface, self.composite_interface, "pair"]
+        )
+        assert_that(composite.manager).is_same_as(manager)
+        assert_that(pair.manager).is_same_as(manager)
+        assert_that(pair.composite).is_same_as(composite)
+
+    def test_resolve_many_does_not_share_instances_between_calls(self):
+        first = self.container.resolve_many([self.type_interface])
+        second = self.container.resolve_many([self.type_interface])
+        assert_that(first[0]).is_not_same_as(second[0])
+
+    def test_frozen_container_resolves_registrations(self):
+        frozen = self.container.freeze()
+        composite = frozen.resolve(self.composite_interface)
+        assert_that(composite.service).is_same_as(self.service)
+        assert_that(composite.manager).is_instance_of(Manager)
+        assert_that(frozen.resolve(self.factory_interface)).is_instance_of(Manager)
+
+    def test_frozen_container_resolves_unregistered_types(self):
+        frozen = self.container.freeze()
+        assert_that(frozen.resolve(CompositeObject)).is_instance_of(CompositeObject)
+        assert_that(frozen.resolve(UnresolvableObject)).is_none()
+        assert_that(frozen.can_resolve(UnresolvableObject)).is_false()
+
+    def test_frozen_container_is_not_affected_by_new_registrations(self):
+        frozen = self.container.freeze()
+        self.container.register_instance(self.type_interface, self.service)
+        assert_that(frozen.resolve(self.type_interface)).is_instance_of(Manager)
+
+    def test_frozen_container_creates_singletons_once(self):
+        self.container.register_factory(self.factory_interface, SlowFactory(), is_singleton=True)
+        frozen = self.container.freeze()
+        assert_that(frozen.resolve(self.factory_interface)).is_same_as(
+            frozen.resolve(self.factory_interface)
+        )
+
+    def test_frozen_container_resolves_keyed_bindings(self):
+        self.container.register_keyed("accounting", "standard", CompositeObject)
+        self.container.register_keyed("accounting", "shared", Manager, is_singleton=True)
+        frozen = self.container.freeze()
+        assert_that(frozen.can_resolve("accounting", key="standard")).is_true()
+        instance = frozen.resolve("accounting", key="standard")
+        assert_that(instance.service).is_same_as(self.service)
+        shared = frozen.resolve("accounting", key="shared")
+        assert_that(frozen.resolve("accounting", key="shared")).is_same_as(shared)
+        assert_that(frozen.resolve("accounting", key="missing")).is_none()
+
+    def test_freeze_reports_dependency_cycles(self):
+        self.container.register_type("first", _make_type("First", ["second"]))
+        self.container.register_type("second", _make_type("Second", ["third"]))
+        self.container.register_type("third", _make_type("Third", ["first"]))
+        with pytest.raises(container.DependencyCycleError) as error:
+            self.container.freeze()
+        assert_that(error.value.cycle).is_length(4)
+        assert_that(error.value.cycle[0]).is_equal_to(error.value.cycle[-1])
+
+    def test_freeze_allows_cycles_broken_by_lazy_registrations(self):
+        self.container.register_type("first", _make_type("First", ["second"]))
+        self.container.register_type("second", _make_type("Second", ["first"]), is_lazy=True)
+        frozen = self.container.freeze()
+        assert_that(frozen.resolve("first")).is_not_none()
+
+    def test_acquire_reuses_pooled_objects(self):
+        self.container.register_pool("pooled", self.factory, max_size=1)
+        with self.container.acquire("pooled") as first:
+            assert_that(self.factory.invoked_container).is_same_as(self.container)
+        with self.container.acquire("pooled") as second:
+            pass
+        assert_that(second).is_same_as(first)
+        stats = self.container.pool_stats("pooled")
+        assert_that(stats.hits).is_equal_to(1)
+        assert_that(stats.misses).is_equal_to(1)
+
+    def test_acquire_raises_exception_for_unregistered_pool(self):
+        with pytest.raises(core_factory.ObjectTypeNotRegisteredError):
+            self.container.acquire("pooled")
+
+    def test_evict_idle_evicts_idle_pooled_objects(self):
+        closed = []
+        self.container.register_pool(
+            "cursor", lambda c: Closeable("cursor", closed), idle_timeout=0.01
+        )
+        with self.container.acquire("cursor"):
+            pass
+        time.sleep(0.02)
+        assert_that(self.container.evict_idle()).is_equal_to({"cursor": 1})
+        assert_that(closed).is_equal_to(["cursor"])
+
+    def test_registering_a_pool_again_closes_the_replaced_pool(self):
+        closed = []
+        self.container.register_pool("cursor", lambda c: Closeable("old", closed))
+        with self.container.acquire("cursor"):
+            pass
+        self.container.register_pool("cursor", lambda c: Closeable("new", closed))
+        assert_that(closed).is_equal_to(["old"])
+        with self.container.acquire("cursor") as cursor:
+            assert_that(cursor.name).is_equal_to("new")
+
+    def test_warm_up_fills_pools(self):
+        self.container.register_pool("pooled", self.factory, min_size=2)
+        self.container.warm_up()
+        assert_that(self.container.pool_stats("pooled").idle).is_equal_to(2)
+
+    def test_can_register_type_by_dotted_path(self):
+        self.container.register_type("path", f"{__name__}:RegisteredCompositeObject")
+        instance = self.container.resolve("path")
+        assert_that(instance).is_instance_of(RegisteredCompositeObject)
+        assert_that(instance.service).is_same_as(self.service)
+
+    def test_dotted_path_is_not_imported_until_resolved(self):
+        self.container.register_type("path", "inexistent_module:Type")
+        with pytest.raises(ImportError):
+            self.container.resolve("path")
+
+    def test_weak_instance_is_shared_while_referenced(self):
+        self.container.register_factory(self.factory_interface, self.factory, is_weak=True)
+        first = self.container.resolve(self.factory_interface)
+        second = self.container.resolve(self.factory_interface)
+        assert_that(first).is_same_as(second)
+
+    def test_weak_instance_is_created_again_once_released(self):
+        self.container.register_factory(
+            self.factory_interface, lambda c: CountedObject(), is_weak=True
+        )
+        value = self.container.resolve(self.factory_interface).value
+        gc.collect()
+        instance = self.container.resolve(self.factory_interface)
+        assert_that(instance.value).is_not_equal_to(value)
+
+    def test_weak_instance_is_shared_by_asynchronous_resolutions(self):
+        factory = AsyncFactory(Service)
+        self.container.register_factory("async_service", factory, is_weak=True)
+
+        async def resolve_concurrently():
+            return await asyncio.gather(
+                *[self.container.resolve_async("async_service") for _ in range(5)]
+            )
+
+        instances = asyncio.run(resolve_concurrently())
+        assert_that(set(map(id, instances))).is_length(1)
+        assert_that(factory.invocations).is_equal_to(1)
+
+    def test_close_disposes_singletons_before_their_dependencies(self):
+        closed = []
+        self._register_closeable_graph(closed)
+        self.container.resolve("repository")
+        report = self.container.close()
+        assert_that(closed).is_equal_to(["repository", "database"])
+        assert_that(report.durations).contains_only("repository", "database")
+        assert_that(report.pending).is_empty()
+
+    def test_close_follows_dependencies_through_transient_objects(self):
+        closed = []
+        self._register_closeable_graph(closed)
+        self.container.register_type("unit_of_work", UnitOfWork)
+        self.container.register_factory(
+            "reporting",
+            lambda c: Closeable("reporting", closed, c.resolve("unit_of_work")),
+            is_singleton=True,
+        )
+        self.container.resolve("database")
+        self.container.resolve("reporting")
+        self.container.close()
+        assert_that(closed).is_equal_to(["reporting", "database"])
+
+    def test_close_does_not_dispose_registered_instances(self):
+        instance = Closeable("instance", [])
+        self.container.register_instance("instance", instance)
+        report = self.container.close()
+        assert_that(report.durations).is_empty()
+
+    def test_close_disposes_independent_singletons_in_parallel(self):
+        barrier = threading.Barrier(2, timeout=5)
+        for interface in ("first", "second"):
+            self.container.register_factory(
+                interface, lambda c: BlockingCloseable(barrier.wait), is_singleton=True
+            )
+            self.container.resolve(interface)
+        report = self.container.close(max_workers=2)
+        assert_that(report.errors).is_empty()
+
+    def test_close_reports_singletons_not_closed_before_timeout(self):
+        event = threading.Event()
+        self.container.register_factory(
+            "slow", lambda c: BlockingCloseable(event.wait), is_singleton=True
+        )
+        instance = self.container.resolve("slow")
+        report = self.container.close(timeout=0.01)
+        event.set()
+        assert_that(report.pending).is_equal_to(["slow"])
+        assert_that(self.container.resolve("slow")).is_not_same_as(instance)
+
+    def test_close_keeps_singletons_that_did_not_start_closing_before_timeout(self):
+        event = threading.Event()
+        closed = []
+        self.container.register_factory(
+            "first", lambda c: BlockingCloseable(event.wait), is_singleton=True
+        )
+        self.container.register_factory(
+            "second", lambda c: Closeable("second", closed), is_singleton=True
+        )
+        first = self.container.resolve("first")
+        second = self.container.resolve("second")
+        report = self.container.close(timeout=0.05, max_workers=1)
+        event.set()
+        time.sleep(0.02)
+        assert_that(report.pending).contains_only("first", "second")
+        assert_that(closed).is_empty()
+        assert_that(self.container.resolve("first")).is_not_same_as(first)
+        assert_that(self.container.resolve("second")).is_same_as(second)
+
+    def test_close_reports_errors_disposing_singletons(self):
+        self.container.register_factory(
+            "failing", lambda c: BlockingCloseable(FailingFactory()), is_singleton=True
+        )
+        self.container.resolve("failing")
+        report = self.container.close()
+        assert_that(report.errors["failing"]).is_instance_of(RuntimeError)
+
+    def test_closed_singletons_are_created_again(self):
+        self._register_closeable_graph([])
+        instance = self.container.resolve("database")
+        self.container.close()
+        assert_that(self.container.resolve("database")).is_not_same_as(instance)
+
+    def test_aclose_awaits_singletons_before_their_dependencies(self):
+        closed = []
+        self._register_closeable_graph(closed, AsyncCloseable)
+        asyncio.run(self.container.resolve_async("repository"))
+        report = asyncio.run(self.container.aclose())
+        assert_that(closed).is_equal_to(["repository", "database"])
+        assert_that(report.durations).contains_only("repository", "database")
+
+    def test_close_disposes_idle_pooled_objects_before_singletons(self):
+        closed = []
+        self._register_closeable_graph(closed)
+        self.container.register_pool(
+            "cursor", lambda c: Closeable("cursor", closed, c.resolve("database")), min_size=2
+        )
+        self.container.warm_up()
+        report = self.container.close()
+        assert_that(closed).is_equal_to(["cursor", "cursor", "repository", "database"])
+        assert_that(report.durations).contains_key("cursor")
+        assert_that(self.container.pool_stats("cursor").size).is_equal_to(0)
+
+    def test_close_disposes_pooled_objects_with_the_dispose_callback(self):
+        disposed = []
+        self.container.register_pool("pooled", self.factory, dispose=disposed.append)
+        with self.container.acquire("pooled") as instance:
+            pass
+        self.container.close()
+        assert_that(disposed).is_equal_to([instance])
+
+    def test_aclose_disposes_idle_pooled_objects(self):
+        closed = []
+        self.container.register_pool("cursor", lambda c: Closeable("cursor", closed))
+        with self.container.acquire("cursor"):
+            pass
+        report = asyncio.run(self.container.aclose())
+        assert_that(closed).is_equal_to(["cursor"])
+        assert_that(report.durations).contains_only("cursor")
+
+    def _register_closeable_graph(self, closed, closeable_type=None):
+        closeable_type = closeable_type or Closeable
+        self.container.register_factory(
+            "database", lambda c: closeable_type("database", closed), is_singleton=True
+        )
+        self.container.register_factory(
+            "repository",
+            lambda c: closeable_type("repository", closed, c.resolve("database")),
+            is_singleton=True,
+        )
+
+    def test_constructor_is_introspected_once_for_repeated_resolutions(self):
+        with mock.patch.object(
+            container.inspect, "getfullargspec", wraps=container.inspect.getfullargspec
+        ) as getfullargspec:
+            self.container.resolve(self.composite_interface)
+            self.container.resolve(self.composite_interface)
+        assert_that(getfullargspec.call_count).is_equal_to(2)
+
+    def test_unresolvable_types_are_introspected_once(self):
+        with mock.patch.object(
+            container.inspect, "getfullargspec", wraps=container.inspect.getfullargspec
+        ) as getfullargspec:
+            self.container.resolve(UnresolvableObject)
+            self.container.resolve(UnresolvableObject)
+            self.container.can_resolve(UnresolvableObject)
+        assert_that(getfullargspec.call_count).is_equal_to(1)
+
+    def test_deep_dependency_graph_is_introspected_once_per_node(self):
+        depth = 50
+        for level in range(depth):
+            self.container.register_type(f"level_{level}", _make_level_type(level))
+        with mock.patch.object(
+            container.inspect, "getfullargspec", wraps=container.inspect.getfullargspec
+        ) as getfullargspec:
+            instance = self.container.resolve(f"level_{depth - 1}")
+        assert_that(getfullargspec.call_count).is_equal_to(depth)
+        assert_that(instance.dependency.dependency).is_not_none()
+
+    def test_registering_an_instance_invalidates_resolution_plans(self):
+        self.container.resolve(self.type_interface)
+        manager = Manager()
+        self.container.register_instance(self.type_interface, manager)
+        assert_that(self.container.resolve(self.type_interface)).is_same_as(manager)
+
+    def test_registering_a_type_invalidates_resolution_plans(self):
+        self.container.resolve(self.factory_interface)
+        self.container.register_type(self.factory_interface, Service)
+        instance = self.container.resolve(self.factory_interface)
+        assert_that(instance).is_instance_of(Service)
+
+    def test_registering_a_factory_invalidates_resolution_plans(self):
+        self.container.resolve(CompositeObject)
+        self.container.register_factory(CompositeObject, lambda c: self.service)
+        instance = self.container.resolve(CompositeObject)
+        assert_that(instance).is_same_as(self.service)
+
+    def test_resolves_keyed_types_with_constructor_injection(self):
+        self.container.register_keyed("accounting", "standard", Manager)
+        self.container.register_keyed("accounting", "composite", CompositeObject)
+        instance = self.container.resolve("accounting", key="composite")
+        assert_that(instance).is_instance_of(CompositeObject)
+        assert_that(instance.service).is_same_as(self.service)
+        assert_that(self.container.resolve("accounting", key="standard")).is_instance_of(Manager)
+
+    def test_invokes_keyed_builders_with_the_container(self):
+        self.container.register_keyed("accounting", "function", self.factory)
+        self.container.register_keyed("accounting", "builder", ManagerBuilder())
+        assert_that(self.container.resolve("accounting", key="function")).is_instance_of(Manager)
+        assert_that(self.factory.invoked_container).is_same_as(self.container)
+        instance = self.container.resolve("accounting", key="builder")
+        assert_that(instance.container).is_same_as(self.container)
+
+    def test_resolves_keyed_singletons_once_per_key(self):
+        self.container.register_keyed("accounting", "standard", Manager, is_singleton=True)
+        self.container.register_keyed("accounting", "transient", Manager)
+        standard = self.container.resolve("accounting", key="standard")
+        assert_that(self.container.resolve("accounting", key="standard")).is_same_as(standard)
+        transient = self.container.resolve("accounting", key="transient")
+        assert_that(transient).is_not_same_as(standard)
+        assert_that(self.container.resolve("accounting", key="transient")).is_not_same_as(
+            transient
+        )
+
+    def test_resolves_keyed_dotted_paths(self):
+        self.container.register_keyed("accounting", "standard", f"{__name__}:Manager")
+        instance = self.container.resolve("accounting", key="standard")
+        assert_that(instance).is_instance_of(Manager)
+
+    def test_returns_none_for_unregistered_keys(self):
+        self.container.register_keyed("accounting", "standard", Manager)
+        self.container.register_keyed("accounting", "unresolvable", UnresolvableObject)
+        assert_that(self.container.can_resolve("accounting", key="standard")).is_true()
+        assert_that(self.container.can_resolve("accounting", key="missing")).is_false()
+        assert_that(self.container.can_resolve("accounting", key="unresolvable")).is_false()
+        assert_that(self.container.resolve("accounting", key="missing")).is_none()
+        assert_that(self.container.resolve("accounting")).is_none()
+
+    def test_scope_shares_transient_keyed_objects(self):
+        self.container.register_keyed("accounting", "standard", Manager)
+        with self.container.scope() as scope:
+            instance = scope.resolve("accounting", key="standard")
+            assert_that(scope.resolve("accounting", key="standard")).is_same_as(instance)
+        assert_that(self.container.resolve("accounting", key="standard")).is_not_same_as(
+            instance
+        )
+
+    def test_close_disposes_keyed_singletons(self):
+        closed = []
+        self.container.register_keyed(
+            "connection", "primary", lambda c: Closeable("primary", closed), is_singleton=True
+        )
+        primary = self.container.resolve("connection", key="primary")
+        self.container.close()
+        assert_that(closed).is_equal_to(["primary"])
+        assert_that(self.container.resolve("connection", key="primary")).is_not_same_as(primary)
+
+
+    def test_child_resolves_parent_registrations(self):
+        child = self.container.child()
+        instance = child.resolve(self.composite_interface)
+        assert_that(instance.service).is_same_as(self.service)
+        assert_that(child.can_resolve(self.factory_interface)).is_true()
+
+    def test_child_overrides_do_not_affect_parent(self):
+        child = self.container.child()
+        service = Service()
+        child.register_instance(self.service_interface, service)
+        assert_that(child.resolve(self.composite_interface).service).is_same_as(service)
+        assert_that(self.container.resolve(self.composite_interface).service).is_same_as(
+            self.service
+        )
+
+    def test_child_sees_later_parent_registrations(self):
+        child = self.container.child()
+        child.resolve(self.composite_interface)
+        service = Service()
+        self.container.register_instance(self.service_interface, service)
+        assert_that(child.resolve(self.composite_interface).service).is_same_as(service)
+
+    def test_parent_singletons_are_shared_with_children(self):
+        self.container.register_factory("database", lambda c: Manager(), is_singleton=True)
+        first = self.container.child()
+        second = self.container.child()
+        database = first.resolve("database")
+        assert_that(second.resolve("database")).is_same_as(database)
+        assert_that(self.container.resolve("database")).is_same_as(database)
+        first.close()
+        assert_that(self.container.resolve("database")).is_same_as(database)
+
+    def test_child_singletons_are_owned_by_the_child(self):
+        child = self.container.child()
+        child.register_factory("database", lambda c: Manager(), is_singleton=True)
+        database = child.resolve("database")
+        assert_that(child.resolve("database")).is_same_as(database)
+        assert_that(self.container.can_resolve("database")).is_false()
+
+    def test_grandchild_resolves_through_the_parent_chain(self):
+        child = self.container.child()
+        child.register_type("pair", ManagerPair)
+        grandchild = child.child()
+        instance = grandchild.resolve("pair")
+        assert_that(instance.composite.service).is_same_as(self.service)
+
+    def test_child_resolves_parent_keyed_singletons(self):
+        self.container.register_keyed("accounting", "standard", Manager, is_singleton=True)
+        child = self.container.child()
+        instance = child.resolve("accounting", key="standard")
+        assert_that(self.container.resolve("accounting", key="standard")).is_same_as(instance)
+
+    def test_child_sees_parent_reregistration_of_dotted_paths(self):
+        self.container.register_type("handler", f"{__name__}:Manager")
+        child = self.container.child()
+        assert_that(child.resolve("handler")).is_instance_of(Manager)
+        self.container.register_type("handler", Service)
+        assert_that(child.resolve("handler")).is_instance_of(Service)
+
+    def test_child_shares_parent_keyed_singletons_registered_by_dotted_path(self):
+        self.container.register_keyed(
+            "accounting", "standard", f"{__name__}:Manager", is_singleton=True
+        )
+        first = self.container.child()
+        second = self.container.child()
+        instance = first.resolve("accounting", key="standard")
+        assert_that(second.resolve("accounting", key="standard")).is_same_as(instance)
+        assert_that(self.container.resolve("accounting", key="standard")).is_same_as(instance)
+
+    def test_child_serves_parent_singletons_without_the_parent_once_created(self):
+        self.container.register_factory("database", lambda c: Manager(), is_singleton=True)
+        self.container.register_keyed("accounting", "standard", Manager, is_singleton=True)
+        child = self.container.child()
+        database = child.resolve("database")
+        accounting = child.resolve("accounting", key="standard")
+        with mock.patch.object(
+            self.container, "_create_instance_from_factory"
+        ) as create, mock.patch.object(self.container, "_resolve_keyed") as resolve_keyed:
+            assert_that(child.resolve("database")).is_same_as(database)
+            assert_that(child.resolve("accounting", key="standard")).is_same_as(accounting)
+        create.assert_not_called()
+        resolve_keyed.assert_not_called()
+
+    def test_children_are_not_kept_alive_by_the_parent(self):
+        self.container.child()
+        gc.collect()
+        assert_that(list(self.container._children)).is_empty()
+
+
+    def test_reregistering_evicts_transitive_dependents(self):
+        self.container.register_factory(
+            "database", lambda c: Closeable("database", []), is_singleton=True
+        )
+        self.container.register_factory(
+            "repository", lambda c: UnitOfWork(c.resolve("database")), is_singleton=True
+        )
+        self.container.register_factory(
+            "handler", lambda c: UnitOfWork(c.resolve("repository")), is_singleton=True
+        )
+        self.container.register_factory("unrelated", lambda c: Manager(), is_singleton=True)
+        handler = self.container.resolve("handler")
+        unrelated = self.container.resolve("unrelated")
+        evicted = self.container.register_instance("database", Service())
+        assert_that({eviction.interface: eviction.instance for eviction in evicted}).is_equal_to(
+            {
+                "database": handler.database.database,
+                "repository": handler.database,
+                "handler": handler,
+            }
+        )
+        assert_that({eviction.container for eviction in evicted}).is_equal_to({self.container})
+        rebuilt = self.container.resolve("handler")
+        assert_that(rebuilt).is_not_same_as(handler)
+        assert_that(rebuilt.database.database).is_instance_of(Service)
+        assert_that(self.container.resolve("unrelated")).is_same_as(unrelated)
+
+    def test_evicts_dependents_through_transient_types(self):
+        self.container.register_factory(
+            "pair", lambda c: c.resolve(ManagerPair), is_singleton=True
+        )
+        pair = self.container.resolve("pair")
+        evicted = self.container.register_instance(self.service_interface, Service())
+        assert_that(evicted).is_equal_to([container.Eviction(self.container, "pair", pair)])
+
+    def test_first_registration_evicts_nothing(self):
+        self.container.register_factory("database", lambda c: Manager(), is_singleton=True)
+        self.container.resolve("database")
+        assert_that(self.container.register_type("new", Manager)).is_empty()
+
+    def test_reregistering_evicts_keyed_singletons(self):
+        self.container.register_keyed(
+            "handler", "primary", lambda c: UnitOfWork(c.resolve("manager")), is_singleton=True
+        )
+        handler = self.container.resolve("handler", key="primary")
+        evicted = self.container.register_type("manager", Service)
+        assert_that([eviction.instance for eviction in evicted]).is_equal_to([handler])
+        assert_that(self.container.resolve("handler", key="primary").database).is_instance_of(
+            Service
+        )
+
+    def test_reregistering_in_parent_evicts_child_dependents(self):
+        child = self.container.child()
+        child.register_factory(
+            "handler", lambda c: UnitOfWork(c.resolve("manager")), is_singleton=True
+        )
+        handler = child.resolve("handler")
+        self.container.register_factory("database", lambda c: Manager(), is_singleton=True)
+        database = self.container.resolve("database")
+        evicted = self.container.register_type("manager", Service)
+        assert_that(evicted).is_equal_to([container.Eviction(child, "handler", handler)])
+        assert_that(child.resolve("handler")).is_not_same_as(handler)
+        assert_that(self.container.resolve("database")).is_same_as(database)
+
+
+    def test_reregistering_in_parent_evicts_child_dependents_of_parent_singletons(self):
+        self.container.register_instance("config", Service())
+        self.container.register_factory(
+            "pool", lambda c: UnitOfWork(c.resolve("config")), is_singleton=True
+        )
+        child = self.container.child()
+        child.register_factory(
+            "handler", lambda c: UnitOfWork(c.resolve("pool")), is_singleton=True
+        )
+        handler = child.resolve("handler")
+        config = Service()
+        evicted = self.container.register_instance("config", config)
+        assert_that(evicted).is_equal_to(
+            [
+                container.Eviction(child, "handler", handler),
+                container.Eviction(self.container, "pool", handler.database),
+            ]
+        )
+        assert_that(child.resolve("handler").database.database).is_same_as(config)
 
 class Service:
     pass
@@ -102,12 +1034,48 @@ class CompositeObject:
         self.manager = manager
 
 
+class CountedObject:
+    instances = 0
+
+    def __init__(self):
+        CountedObject.instances += 1
+        self.value = CountedObject.instances
+
+
+class ManagerPair:
+    def __init__(self, composite, manager):
+        self.composite = composite
+        self.manager = manager
+
+
 class UnresolvableObject:
     def __init__(self, x, y):
         self.x = x
         self.y = y
 
 
+def _make_type(name, arguments):
+    parameters = ", ".join(["self"] + arguments)
+    namespace = {}
+    exec(f"def __init__({parameters}):\n    self.arguments = [{parameters}][1:]", namespace)
+    return type(name, (), {"__init__": namespace["__init__"]})
+
+
+def _make_level_type(level):
+    if level == 0:
+        return Manager
+    level_type = _make_type(f"Level{level}", [f"level_{level - 1}"])
+    level_type.dependency = property(lambda self: self.arguments[0])
+    return level_type
+
+
+class ManagerBuilder:
+    def build(self, container):
+        manager = Manager()
+        manager.container = container
+        return manager
+
+
 class Factory:
     def __init__(self):
         self.invoked_container = None
@@ -117,6 +1085,75 @@ class Factory:
         return Manager()
 
 
+class SlowFactory:
+    def __init__(self):
+        self.invocations = 0
+
+    def __call__(self, container):
+        self.invocations += 1
+        time.sleep(0.01)
+        return Manager()
+
+
+class ConcurrencyTracker:
+    def __init__(self):
+        self.concurrent = 0
+        self.max_concurrent = 0
+
+
+class AsyncFactory:
+    def __init__(self, type_class, tracker=None):
+        self.type_class = type_class
+        self.tracker = tracker or ConcurrencyTracker()
+        self.invocations = 0
+
+    async def __call__(self, container):
+        self.invocations += 1
+        self.tracker.concurrent += 1
+        self.tracker.max_concurrent = max(
+            self.tracker.max_concurrent, self.tracker.concurrent
+        )
+        await asyncio.sleep(0.01)
+        self.tracker.concurrent -= 1
+        return self.type_class()
+
+
+class Closeable:
+    def __init__(self, name, closed, dependency=None):
+        self.name = name
+        self.closed = closed
+        self.dependency = dependency
+
+    def close(self):
+        self.closed.append(self.name)
+
+
+class AsyncCloseable(Closeable):
+    def close(self):
+        raise AssertionError("aclose() should be awaited instead")
+
+    async def aclose(self):
+        await asyncio.sleep(0)
+        self.closed.append(self.name)
+
+
+class UnitOfWork:
+    def __init__(self, database):
+        self.database = database
+
+
+class BlockingCloseable:
+    def __init__(self, block):
+        self.block = block
+
+    def close(self):
+        self.block()
+
+
+class FailingFactory:
+    def __call__(self, *args):
+        raise RuntimeError()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,30 @@
+import os.path
+import unittest
+
+from assertpy import assert_that
+import pytest
+
+import pythern.importing as importing
+
+
+class TestImportObject(unittest.TestCase):
+    def test_imports_object_from_module(self):
+        assert_that(importing.import_object("os.path:join")).is_same_as(os.path.join)
+
+    def test_imports_nested_attributes(self):
+        imported = importing.import_object(f"{__name__}:TestImportObject.nested")
+        assert_that(imported).is_equal_to("nested")
+
+    def test_raises_exception_for_invalid_path(self):
+        with pytest.raises(ValueError):
+            importing.import_object("os.path.join")
+
+    def test_raises_exception_if_module_does_not_exist(self):
+        with pytest.raises(ImportError):
+            importing.import_object("inexistent_module:Name")
+
+    nested = "nested"
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import gc
 import unittest
 
 from assertpy import assert_that
@@ -51,6 +52,123 @@ class TestObjectBuilderFactory(unittest.TestCase):
         self.factory.create(self.type_id)
         assert_that(self.callable_method_called).is_true()
 
+    def test_unregistered_type_cannot_be_created(self):
+        self.factory.register_type(self.type_id, self.test_builder)
+        self.factory.unregister_type(self.type_id)
+        with pytest.raises(core_factory.ObjectTypeNotRegisteredError):
+            self.factory.create(self.type_id)
+
+    def test_can_create_many_objects_of_registered_type(self):
+        self.factory.register_type(self.type_id, Product)
+        products = self.factory.create_many(self.type_id, [(1,), (2,), (3,)])
+        assert_that([product.args for product in products]).is_equal_to(
+            [(1,), (2,), (3,)]
+        )
+
+    def test_forwards_keyword_arguments_when_creating_many_objects(self):
+        self.factory.register_type(self.type_id, self.test_builder)
+        self.factory.create_many(self.type_id, [(1, 2)], a=1)
+        assert_that(self.test_builder.args).is_equal_to((1, 2))
+        assert_that(self.test_builder.kwargs).is_equal_to({"a": 1})
+
+    def test_raises_exception_creating_many_objects_when_nothing_registered(self):
+        with pytest.raises(core_factory.ObjectTypeNotRegisteredError):
+            self.factory.create_many(self.type_id, [()])
+
+    def test_prototype_is_built_once(self):
+        builder = PrototypeBuilder()
+        self.factory.register_prototype(self.type_id, builder)
+        self.factory.create(self.type_id)
+        self.factory.create(self.type_id)
+        assert_that(builder.invocations).is_equal_to(1)
+        assert_that(self.factory.is_registered(self.type_id)).is_true()
+
+    def test_creates_shallow_copies_of_prototype(self):
+        self.factory.register_prototype(self.type_id, PrototypeBuilder())
+        first = self.factory.create(self.type_id)
+        second = self.factory.create(self.type_id)
+        assert_that(first).is_not_same_as(second)
+        assert_that(first.items).is_same_as(second.items)
+
+    def test_creates_deep_copies_of_prototype(self):
+        self.factory.register_prototype(self.type_id, PrototypeBuilder(), deep=True)
+        first = self.factory.create(self.type_id)
+        second = self.factory.create(self.type_id)
+        assert_that(first.items).is_equal_to(second.items)
+        assert_that(first.items).is_not_same_as(second.items)
+
+    def test_keyword_arguments_override_prototype_attributes(self):
+        self.factory.register_prototype(self.type_id, PrototypeBuilder())
+        product = self.factory.create(self.type_id, name="custom")
+        assert_that(product.name).is_equal_to("custom")
+        assert_that(self.factory.create(self.type_id).name).is_equal_to("prototype")
+
+    def test_lru_cache_returns_same_object_for_same_arguments(self):
+        cache = core_factory.LRUCache(max_size=2)
+        self.factory.register_type(self.type_id, Product, cache=cache)
+        first = self.factory.create(self.type_id, 1, name="a")
+        second = self.factory.create(self.type_id, 1, name="a")
+        third = self.factory.create(self.type_id, 2, name="a")
+        assert_that(first).is_same_as(second)
+        assert_that(first).is_not_same_as(third)
+        assert_that(cache.hits).is_equal_to(1)
+        assert_that(cache.misses).is_equal_to(2)
+
+    def test_lru_cache_evicts_least_recently_used_objects(self):
+        cache = core_factory.LRUCache(max_size=2)
+        self.factory.register_type(self.type_id, Product, cache=cache)
+        first = self.factory.create(self.type_id, 1)
+        self.factory.create(self.type_id, 2)
+        self.factory.create(self.type_id, 1)
+        self.factory.create(self.type_id, 3)
+        assert_that(len(cache)).is_equal_to(2)
+        assert_that(self.factory.create(self.type_id, 1)).is_same_as(first)
+        assert_that(cache.misses).is_equal_to(3)
+
+    def test_cache_does_not_store_objects_with_unhashable_arguments(self):
+        cache = core_factory.LRUCache()
+        self.factory.register_type(self.type_id, Product, cache=cache)
+        first = self.factory.create(self.type_id, [1])
+        second = self.factory.create(self.type_id, [1])
+        assert_that(first).is_not_same_as(second)
+        assert_that(cache.misses).is_equal_to(2)
+
+    def test_cache_does_not_store_objects_with_unhashable_keyword_arguments(self):
+        cache = core_factory.LRUCache()
+        self.factory.register_type(self.type_id, Product, cache=cache)
+        first = self.factory.create(self.type_id, 1, name=["a"])
+        second = self.factory.create(self.type_id, 1, name=["a"])
+        assert_that(first).is_not_same_as(second)
+        assert_that(cache.misses).is_equal_to(2)
+
+    def test_cache_key_does_not_depend_on_keyword_argument_order(self):
+        cache = core_factory.LRUCache()
+        self.factory.register_type(self.type_id, Product, cache=cache)
+        first = self.factory.create(self.type_id, value=1, name="a")
+        assert_that(self.factory.create(self.type_id, name="a", value=1)).is_same_as(
+            first
+        )
+
+    def test_weak_value_cache_releases_unused_objects(self):
+        cache = core_factory.WeakValueCache()
+        self.factory.register_type(self.type_id, Product, cache=cache)
+        first = self.factory.create(self.type_id, 1)
+        assert_that(self.factory.create(self.type_id, 1)).is_same_as(first)
+        del first
+        gc.collect()
+        assert_that(len(cache)).is_equal_to(0)
+
+    def test_can_register_builder_by_dotted_path(self):
+        self.factory.register_type(self.type_id, f"{__name__}:Product")
+        product = self.factory.create(self.type_id, 1)
+        assert_that(product).is_instance_of(Product)
+        assert_that(product.args).is_equal_to((1,))
+
+    def test_dotted_path_is_not_imported_until_created(self):
+        self.factory.register_type(self.type_id, "inexistent_module:builder")
+        with pytest.raises(ImportError):
+            self.factory.create(self.type_id)
+
     def callable_method(self, *args, **kwargs):
         self.callable_method_called = True
 
@@ -65,5 +183,23 @@ class BuilderDouble:
         return self.object_to_build
 
 
+class Product:
+    def __init__(self, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+
+
+class PrototypeBuilder:
+    def __init__(self):
+        self.invocations = 0
+
+    def build(self):
+        self.invocations += 1
+        product = Product()
+        product.name = "prototype"
+        product.items = [1, 2, 3]
+        return product
+
+
 if __name__ == "__main__":
     unittest.main()
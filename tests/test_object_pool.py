@@ -0,0 +1,126 @@
+import threading
+import time
+import unittest
+
+from assertpy import assert_that
+import pytest
+
+import pythern.object_pool as object_pool
+
+
+class TestObjectPool(unittest.TestCase):
+    def setUp(self):
+        self.created = []
+        self.disposed = []
+        self.pool = object_pool.ObjectPool(
+            self.create, max_size=2, dispose=self.disposed.append
+        )
+
+    def create(self):
+        instance = PooledObject()
+        self.created.append(instance)
+        return instance
+
+    def test_creates_new_object_when_pool_is_empty(self):
+        instance = self.pool.acquire()
+        assert_that(self.created).is_equal_to([instance])
+        assert_that(self.pool.stats().misses).is_equal_to(1)
+
+    def test_reuses_released_objects(self):
+        with self.pool.lease() as first:
+            pass
+        with self.pool.lease() as second:
+            pass
+        assert_that(second).is_same_as(first)
+        stats = self.pool.stats()
+        assert_that(stats.hits).is_equal_to(1)
+        assert_that(stats.misses).is_equal_to(1)
+        assert_that(stats.idle).is_equal_to(1)
+
+    def test_raises_exception_when_exhausted_pool_times_out(self):
+        self.pool.acquire()
+        self.pool.acquire()
+        with pytest.raises(object_pool.PoolExhaustedError):
+            self.pool.acquire(timeout=0.01)
+
+    def test_waits_for_released_object_when_pool_is_exhausted(self):
+        first = self.pool.acquire()
+        self.pool.acquire()
+        timer = threading.Timer(0.01, self.pool.release, [first])
+        timer.start()
+        assert_that(self.pool.acquire(timeout=5)).is_same_as(first)
+        timer.join()
+
+    def test_evicts_idle_objects_above_minimum_size(self):
+        pool = object_pool.ObjectPool(
+            self.create, min_size=1, idle_timeout=0.01, dispose=self.disposed.append
+        )
+        first = pool.acquire()
+        second = pool.acquire()
+        pool.release(first)
+        pool.release(second)
+        time.sleep(0.02)
+        pool.release(pool.acquire())
+        stats = pool.stats()
+        assert_that(stats.evictions).is_equal_to(1)
+        assert_that(stats.size).is_equal_to(1)
+        assert_that(self.disposed).is_equal_to([first])
+
+    def test_evict_idle_evicts_objects_without_acquiring(self):
+        pool = object_pool.ObjectPool(
+            self.create, min_size=1, idle_timeout=0.01, dispose=self.disposed.append
+        )
+        first = pool.acquire()
+        second = pool.acquire()
+        pool.release(first)
+        pool.release(second)
+        time.sleep(0.02)
+        assert_that(pool.evict_idle()).is_equal_to(1)
+        assert_that(self.disposed).is_equal_to([first])
+        assert_that(pool.stats().idle).is_equal_to(1)
+
+    def test_fill_creates_objects_up_to_minimum_size(self):
+        pool = object_pool.ObjectPool(self.create, min_size=3)
+        pool.fill()
+        assert_that(pool.stats().idle).is_equal_to(3)
+        assert_that(self.created).is_length(3)
+
+    def test_drain_disposes_idle_objects(self):
+        pool = object_pool.ObjectPool(self.create, min_size=2, dispose=self.disposed.append)
+        pool.fill()
+        in_use = pool.acquire()
+        pool.drain()
+        assert_that(self.disposed).is_length(1)
+        assert_that(self.disposed).does_not_contain(in_use)
+        stats = pool.stats()
+        assert_that(stats.size).is_equal_to(1)
+        assert_that(stats.idle).is_equal_to(0)
+
+    def test_closed_pool_disposes_released_objects(self):
+        idle = self.pool.acquire()
+        in_use = self.pool.acquire()
+        self.pool.release(idle)
+        self.pool.close()
+        assert_that(self.disposed).is_equal_to([idle])
+        self.pool.release(in_use)
+        assert_that(self.disposed).is_equal_to([idle, in_use])
+        assert_that(self.pool.stats().size).is_equal_to(0)
+
+    def test_failed_creation_does_not_count_towards_size(self):
+        pool = object_pool.ObjectPool(FailingFactory(), max_size=1)
+        with pytest.raises(RuntimeError):
+            pool.acquire()
+        assert_that(pool.stats().size).is_equal_to(0)
+
+
+class PooledObject:
+    pass
+
+
+class FailingFactory:
+    def __call__(self):
+        raise RuntimeError()
+
+
+if __name__ == "__main__":
+    unittest.main()
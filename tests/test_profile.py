@@ -0,0 +1,99 @@
+import contextlib
+import io
+import json
+import unittest
+
+from assertpy import assert_that
+
+import pythern.container as container
+import pythern.profile as profile
+
+
+class TestProfile(unittest.TestCase):
+    def setUp(self):
+        self.container = build_container()
+
+    def test_reports_tree_of_constructed_objects(self):
+        roots = profile.profile_container(self.container)
+        composite = find_node(roots, "composite")
+        assert_that(composite["instances"]).is_equal_to(2)
+        assert_that([child["interface"] for child in composite["children"]]).is_equal_to(
+            ["manager"]
+        )
+
+    def test_reports_keyed_bindings(self):
+        roots = profile.profile_container(self.container)
+        accounting = find_node(roots, "accounting['standard']")
+        assert_that(accounting["instances"]).is_equal_to(2)
+
+    def test_keeps_instrumentation_enabled_before_profiling(self):
+        self.container.enable_instrumentation()
+        profile.profile_container(self.container)
+        assert_that(self.container.is_instrumented()).is_true()
+
+    def test_reports_memory_allocated_by_each_node(self):
+        roots = profile.profile_container(self.container)
+        assert_that(find_node(roots, "buffer")["memory"]).is_greater_than(100000)
+
+    def test_reports_errors_resolving_interfaces(self):
+        self.container.register_factory("failing", failing_factory)
+        roots = profile.profile_container(self.container)
+        assert_that(find_node(roots, "failing")["error"]).contains("RuntimeError")
+
+    def test_removes_instrumentation_after_profiling(self):
+        profile.profile_container(self.container)
+        self.container.resolve("composite")
+        assert_that(self.container.stats()["composite"].resolutions).is_equal_to(1)
+
+    def test_prints_tree(self):
+        output = run_main([f"{__name__}:build_container"])
+        assert_that(output).contains("composite")
+        assert_that(output).contains("    manager")
+
+    def test_prints_json(self):
+        output = json.loads(run_main([f"{__name__}:build_container", "--json"]))
+        assert_that(output["builder"]).is_equal_to(f"{__name__}:build_container")
+        assert_that(find_node(output["roots"], "composite")["instances"]).is_equal_to(2)
+
+
+def run_main(argv):
+    stdout = io.StringIO()
+    with contextlib.redirect_stdout(stdout):
+        profile.main(argv)
+    return stdout.getvalue()
+
+
+def find_node(roots, interface):
+    return next(node for node in roots if node["interface"] == interface)
+
+
+def build_container():
+    di_container = container.Container()
+    di_container.register_instance("service", Service())
+    di_container.register_type("manager", Manager)
+    di_container.register_type("composite", Composite)
+    di_container.register_factory("buffer", lambda c: bytearray(200000), is_singleton=True)
+    di_container.register_keyed("accounting", "standard", Composite)
+    return di_container
+
+
+def failing_factory(container):
+    raise RuntimeError()
+
+
+class Service:
+    pass
+
+
+class Manager:
+    pass
+
+
+class Composite:
+    def __init__(self, service, manager):
+        self.service = service
+        self.manager = manager
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,6 @@
+import asyncio
+import os
+import threading
 import unittest
 
 from assertpy import assert_that
@@ -11,10 +14,131 @@ class TestSingleton(unittest.TestCase):
         second_instance = SingletonType()
         assert_that(first_instance).is_same_as(second_instance)
 
+    def test_instantiate_shared_creates_shared_singletons(self):
+        singleton.Singleton._instances.pop(SharedSingletonType, None)
+        instances = singleton.instantiate_shared()
+        assert_that(instances).contains(SharedSingletonType())
+        assert_that(instances).does_not_contain(ResetSingletonType())
+
+    def test_derived_singletons_inherit_fork_policy(self):
+        assert_that(singleton.instantiate_shared()).contains(
+            DerivedSharedSingletonType()
+        )
+
+    def test_invalid_fork_policy_raises_exception(self):
+        with self.assertRaises(ValueError):
+
+            class InvalidPolicy(metaclass=singleton.Singleton, fork_policy="invalid"):
+                pass
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires os.fork()")
+    def test_fork_policies_are_applied_in_child_process(self):
+        shared = SharedSingletonType()
+        reset = ResetSingletonType()
+        inherited = SingletonType()
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            result = (
+                SharedSingletonType() is shared,
+                ResetSingletonType() is not reset,
+                SingletonType() is inherited,
+            )
+            os.write(write_end, bytes(result))
+            os._exit(0)
+        os.close(write_end)
+        result = os.read(read_end, 3)
+        os.close(read_end)
+        os.waitpid(pid, 0)
+        assert_that(tuple(result)).is_equal_to((1, 1, 1))
+        assert_that(ResetSingletonType()).is_same_as(reset)
+
+
+class TestThreadLocalSingleton(unittest.TestCase):
+    def tearDown(self):
+        ThreadLocalType.dispose_instances()
+
+    def test_returns_same_instance_in_the_same_thread(self):
+        assert_that(ThreadLocalType()).is_same_as(ThreadLocalType())
+
+    def test_returns_different_instances_in_different_threads(self):
+        instance = ThreadLocalType()
+        other = run_in_thread(ThreadLocalType)
+        assert_that(other).is_not_same_as(instance)
+
+    def test_enumerates_instances_of_running_threads(self):
+        instance = ThreadLocalType()
+        run_in_thread(ThreadLocalType)
+        assert_that(ThreadLocalType.all_instances()).is_equal_to([instance])
+
+    def test_disposes_instances_of_all_threads(self):
+        instance = ThreadLocalType()
+        disposed = []
+        ThreadLocalType.dispose_instances(disposed.append)
+        assert_that(disposed).is_equal_to([instance])
+        assert_that(ThreadLocalType()).is_not_same_as(instance)
+
+
+class TestContextLocalSingleton(unittest.TestCase):
+    def tearDown(self):
+        ContextLocalType.dispose_instances()
+
+    def test_returns_same_instance_in_the_same_context(self):
+        assert_that(ContextLocalType()).is_same_as(ContextLocalType())
+
+    def test_returns_different_instances_in_different_tasks(self):
+        async def create_in_tasks():
+            return await asyncio.gather(
+                asyncio.ensure_future(create_instance()),
+                asyncio.ensure_future(create_instance()),
+            )
+
+        async def create_instance():
+            return ContextLocalType()
+
+        first, second = asyncio.run(create_in_tasks())
+        assert_that(first).is_not_same_as(second)
+
+    def test_enumerates_and_disposes_instances(self):
+        instance = ContextLocalType()
+        assert_that(ContextLocalType.all_instances()).contains(instance)
+        disposed = []
+        ContextLocalType.dispose_instances(disposed.append)
+        assert_that(disposed).contains(instance)
+        assert_that(ContextLocalType()).is_not_same_as(instance)
+
+
+def run_in_thread(function):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(function()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+class ThreadLocalType(metaclass=singleton.ThreadLocalSingleton):
+    pass
+
+
+class ContextLocalType(metaclass=singleton.ContextLocalSingleton):
+    pass
+
 
 class SingletonType(metaclass=singleton.Singleton):
     pass
 
 
+class SharedSingletonType(metaclass=singleton.Singleton, fork_policy=singleton.SHARE):
+    pass
+
+
+class DerivedSharedSingletonType(SharedSingletonType):
+    pass
+
+
+class ResetSingletonType(metaclass=singleton.Singleton, fork_policy=singleton.RESET):
+    pass
+
+
 if __name__ == "__main__":
     unittest.main()